@@ -1,67 +1,126 @@
-import pandas as pd
 import csv
-import re
-from typing import List, Dict, Optional
-from csv_parser import extract_scenes as extract_old_scenes
+import hashlib
+import itertools
+import os
+import shutil
+import sys
+from typing import Any, List, Dict, Optional
+from csv_parser import extract_scenes as extract_old_scenes, extract_scenes_iter as iter_old_scenes
+
+# Write buffer for the migrated CSV; rows are small, so let them pile up into ~1 MiB writes
+WRITE_BUFFER_SIZE = 1 << 20
 
-def migrate_csv(old_csv_path: str, new_csv_path: str, language: str = "en", audio_title: str = "Original Audio"):
+class _HashingWriter:
+    """File wrapper that feeds everything written through it into a BLAKE2b digest."""
+    
+    def __init__(self, f):
+        self.f = f
+        self.digest = hashlib.blake2b()
+    
+    def write(self, text: str) -> int:
+        self.digest.update(text.encode('utf-8'))
+        return self.f.write(text)
+
+def _file_digest(path: str) -> str:
+    """BLAKE2b hex digest of a file's bytes."""
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(WRITE_BUFFER_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _convert_scene(scene: Dict[str, Optional[str]], language: str, audio_title: str) -> Dict[str, Optional[str]]:
+    """Convert a scene dict from the old parser into a new-format CSV row."""
+    return {
+        'movie_show': scene['movie_show'],
+        'season_episode': scene.get('season_episode', ''),
+        'episode_title': scene.get('episode_title', ''),
+        'start_timecode': scene['start_timecode'],
+        'end_timecode': scene['end_timecode'],
+        'timeline_placement': scene['timeline_placement'],
+        'comment': scene.get('comment', ''),
+        'language': language,
+        'audio_title': audio_title,
+        'reality_designation': 'EARTH-199999'  # Default reality designation
+    }
+
+def migrate_csv(old_csv_path: str, new_csv_path: str, language: str = "en", audio_title: str = "Original Audio",
+                old_scenes: Optional[List[Dict[str, Optional[str]]]] = None,
+                out_stats: Optional[Dict[str, Any]] = None) -> bool:
     """
     Migrate from old CSV structure to new simplified structure.
     
+    Returns True on success. If out_stats is given, a successful migration
+    fills it with the number of scene rows written ('rows') and a BLAKE2b
+    digest of the new file ('hash') for validate_migration to check.
+    
     Args:
         old_csv_path: Path to the old CSV file
         new_csv_path: Path to save the new CSV file
         language: Default language code for all scenes
         audio_title: Default audio title for all scenes
+        old_scenes: Scenes already extracted from old_csv_path (skips re-parsing it).
+            When omitted, the old CSV is streamed straight into the new file.
+        out_stats: Dict to receive the migration stats
     """
     print(f"Migrating CSV from '{old_csv_path}' to '{new_csv_path}'")
     
-    # Extract scenes using old parser
-    try:
-        old_scenes = extract_old_scenes(old_csv_path)
+    # Extract scenes using old parser, lazily unless they were handed to us
+    if old_scenes is None:
+        if not os.path.exists(old_csv_path):
+            print(f"Error extracting scenes from old CSV: '{old_csv_path}' not found")
+            return False
+        scenes = iter_old_scenes(old_csv_path)
+    else:
         print(f"Extracted {len(old_scenes)} scenes from old format")
-    except Exception as e:
-        print(f"Error extracting scenes from old CSV: {e}")
-        return False
-    
-    # Convert to new format
-    new_scenes = []
-    for scene in old_scenes:
-        new_scene = {
-            'movie_show': scene['movie_show'],
-            'season_episode': scene.get('season_episode', ''),
-            'episode_title': scene.get('episode_title', ''),
-            'start_timecode': scene['start_timecode'],
-            'end_timecode': scene['end_timecode'],
-            'timeline_placement': scene['timeline_placement'],
-            'comment': scene.get('comment', ''),
-            'language': language,
-            'audio_title': audio_title,
-            'reality_designation': 'EARTH-199999'  # Default reality designation
-        }
-        new_scenes.append(new_scene)
+        scenes = old_scenes
+    migrated = 0
     
     # Write new CSV
     columns = ['movie_show', 'season_episode', 'episode_title', 'start_timecode', 'end_timecode', 
                'timeline_placement', 'comment', 'language', 'audio_title', 'reality_designation']
     
+    # The old CSV may still fail to parse part-way through, so write next to the
+    # target and only move the file into place once every scene is converted
+    tmp_path = f"{new_csv_path}.{os.getpid()}.tmp"
     try:
-        with open(new_csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=columns)
+        with open(tmp_path, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as csvfile:
+            hashing_file = _HashingWriter(csvfile)
+            writer = csv.DictWriter(hashing_file, fieldnames=columns)
             writer.writeheader()
-            writer.writerows(new_scenes)
+            # Convert lazily so DictWriter consumes scenes one at a time
+            for scene in scenes:
+                writer.writerow(_convert_scene(scene, language, audio_title))
+                migrated += 1
+        if os.path.exists(new_csv_path):
+            shutil.copymode(new_csv_path, tmp_path)
+        os.replace(tmp_path, new_csv_path)
         
-        print(f"Successfully migrated {len(new_scenes)} scenes to new format")
+        print(f"Successfully migrated {migrated} scenes to new format")
         print(f"New CSV saved to: {new_csv_path}")
+        if out_stats is not None:
+            out_stats.update(rows=migrated, hash=hashing_file.digest.hexdigest())
         return True
         
     except Exception as e:
-        print(f"Error writing new CSV: {e}")
+        print(f"Error migrating CSV: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
         return False
 
-def validate_migration(old_csv_path: str, new_csv_path: str):
+def validate_migration(old_csv_path: str, new_csv_path: str,
+                       old_scenes: Optional[List[Dict[str, Optional[str]]]] = None,
+                       stats: Optional[Dict[str, Any]] = None):
     """
     Validate that the migration was successful by comparing scene counts and key fields.
+    
+    Pass the scenes already extracted for migrate_csv as old_scenes to avoid
+    parsing the old CSV a second time, and the stats migrate_csv filled in to
+    stand in for the old scene count and check the new file against its digest.
+    The new file is always parsed with the new parser, so rows it would drop
+    still show up as a count mismatch.
     """
     print("\nValidating migration...")
     
@@ -69,19 +128,35 @@ def validate_migration(old_csv_path: str, new_csv_path: str):
     from new_csv_parser import extract_scenes as extract_new_scenes
     
     try:
-        old_scenes = extract_old_scenes(old_csv_path)
+        # The file must still be exactly what migrate_csv wrote
+        if stats is not None and 'hash' in stats:
+            if _file_digest(new_csv_path) != stats['hash']:
+                print("⚠️  Warning: New CSV does not match what was written during migration!")
+                return False
+        
+        if old_scenes is not None:
+            old_count = len(old_scenes)
+        elif stats is not None:
+            # migrate_csv wrote one row per old scene, so this is the old count
+            old_count = stats['rows']
+            # Only the first few scenes are compared below, so only those are parsed
+            old_scenes = list(itertools.islice(iter_old_scenes(old_csv_path), 3))
+        else:
+            old_scenes = extract_old_scenes(old_csv_path)
+            old_count = len(old_scenes)
         new_scenes = extract_new_scenes(new_csv_path)
+        new_count = len(new_scenes)
         
-        print(f"Old format scenes: {len(old_scenes)}")
-        print(f"New format scenes: {len(new_scenes)}")
+        print(f"Old format scenes: {old_count}")
+        print(f"New format scenes: {new_count}")
         
-        if len(old_scenes) != len(new_scenes):
+        if old_count != new_count:
             print("⚠️  Warning: Scene count mismatch!")
             return False
         
         # Compare first few scenes
         print("\nComparing first 3 scenes:")
-        for i in range(min(3, len(old_scenes))):
+        for i in range(min(3, len(old_scenes), len(new_scenes))):
             old_scene = old_scenes[i]
             new_scene = new_scenes[i]
             
@@ -127,11 +202,12 @@ def main():
         sys.exit(1)
     
     # Perform migration
-    success = migrate_csv(old_csv_path, new_csv_path, language, audio_title)
+    stats = {}
+    success = migrate_csv(old_csv_path, new_csv_path, language, audio_title, out_stats=stats)
     
     if success:
         # Validate migration
-        validate_migration(old_csv_path, new_csv_path)
+        validate_migration(old_csv_path, new_csv_path, stats=stats)
         print("\\n🎉 Migration completed successfully!")
     else:
         print("\\n❌ Migration failed!")
@@ -154,9 +230,11 @@ if __name__ == '__main__':
         language = sys.argv[3] if len(sys.argv) > 3 else 'en'
         audio_title = sys.argv[4] if len(sys.argv) > 4 else 'Original Audio'
         
-        success = migrate_csv(old_csv, new_csv, language, audio_title)
+        # migrate_csv streams the old file and reports read errors itself
+        stats = {}
+        success = migrate_csv(old_csv, new_csv, language, audio_title, out_stats=stats)
         if success:
-            validate_migration(old_csv, new_csv)
+            validate_migration(old_csv, new_csv, stats=stats)
     else:
         print("Usage: python csv_migrator.py <old_csv_path> [new_csv_path] [language] [audio_title]")
         print("Example: python csv_migrator.py sample_scenes.csv new_scenes.csv en 'Original Audio'") 
\ No newline at end of file
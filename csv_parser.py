@@ -1,10 +1,29 @@
-import pandas as pd
-from typing import List, Dict, Optional
+import csv
+from operator import itemgetter
+from typing import Iterable, Iterator, List, Dict, Optional
 import re
 
+# Section header years (e.g. '2016') and month-only timeline cells (e.g. 'JUN')
+YEAR_RE = re.compile(r'^\d{4}$')
+MONTH_RE = re.compile(r'^(?:JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)$', re.IGNORECASE)
+
+# Columns read from each row: movie/show, season/episode, episode title,
+# start and end timecodes, comment, timeline placement and audio title
+SCENE_COLUMNS = itemgetter(1, 5, 6, 10, 12, 14, 24, 8)
+# Rows shorter than this are padded with blanks so SCENE_COLUMNS never raises
+ROW_WIDTH = 25
+
 def extract_scenes(csv_path: str) -> List[Dict[str, Optional[str]]]:
     """
     Extracts only complete scene rows from the documented CSV file.
+    See extract_scenes_iter for the extraction rules and returned keys.
+    """
+    return list(extract_scenes_iter(csv_path))
+
+def extract_scenes_iter(csv_path: str) -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Yields complete scene rows from the documented CSV file one at a time,
+    so callers that only need a single pass never hold every scene in memory.
 
     Timeline placement extraction rules:
     - If the timeline placement cell contains a year (e.g., '2016', '3500 BCE', '2008'), use it as is.
@@ -12,7 +31,7 @@ def extract_scenes(csv_path: str) -> List[Dict[str, Optional[str]]]:
     - If the timeline placement cell is blank, propagate the last non-blank value (to handle merged cells in the CSV).
     - If the timeline placement cell is a month and no year section header is found above, leave as just the month.
 
-    Returns a list of dicts with keys:
+    Yields dicts with keys:
       - movie_show
       - season_episode (optional)
       - episode_title (optional)
@@ -22,60 +41,65 @@ def extract_scenes(csv_path: str) -> List[Dict[str, Optional[str]]]:
       - timeline_placement
       - audio_title (optional)
     """
-    scenes = []
-    df = pd.read_csv(csv_path, header=None, dtype=str, keep_default_na=False)
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        yield from extract_scenes_from_reader(csv.reader(f))
+
+def extract_scenes_from_reader(reader: Iterable[List[str]]) -> Iterator[Dict[str, Optional[str]]]:
+    """
+    Same as extract_scenes_iter, but reads rows from an already-open csv.reader
+    (or any iterable of row lists), starting at the file's first row.
+    """
+    found = False
+    first_rows = []
     last_scene_timeline = ''
     last_scene_comment = ''
     last_scene_audio_title = ''
-    year_pattern = re.compile(r'^\d{4}$')
-    month_pattern = re.compile(r'^(JAN|FEB|MAR|APR|MAY|JUN|JUL|AUG|SEP|OCT|NOV|DEC)$', re.IGNORECASE)
-    for idx, row in enumerate(df.itertuples(index=False)):
-        movie_show = row[1].strip() if len(row) > 1 else ''
-        season_episode = row[5].strip() if len(row) > 5 else ''
-        episode_title = row[6].strip() if len(row) > 6 else ''
-        start_timecode = row[10].strip() if len(row) > 10 else ''
-        end_timecode = row[12].strip() if len(row) > 12 else ''
-        comment = row[14].strip() if len(row) > 14 else ''
-        timeline_placement = row[24].strip() if len(row) > 24 else ''
-        audio_title = row[8].strip() if len(row) > 8 else ''  # Column 8 for audio_title
+    # Most recent section header year seen so far (row[1] holding a 4-digit year)
+    current_year = ''
+    # Bind the per-row helpers once; the loop body then only touches locals
+    columns = SCENE_COLUMNS
+    # str.strip already hands back the same object when there is nothing to trim
+    strip = str.strip
+    is_year = YEAR_RE.fullmatch
+    is_month = MONTH_RE.fullmatch
+    for row in reader:
+        if len(first_rows) < 2:
+            first_rows.append(tuple(row))
+        if len(row) < ROW_WIDTH:
+            row += [''] * (ROW_WIDTH - len(row))
+        (movie_show, season_episode, episode_title, start_timecode,
+         end_timecode, comment, timeline_placement, audio_title) = map(strip, columns(row))
+
+        # Not a scene row (blank or section header): only the header year carries over
+        if not (movie_show and start_timecode and end_timecode):
+            if is_year(movie_show):
+                current_year = movie_show
+            continue
 
         # Only propagate timeline, comment, and audio_title from previous valid scene rows
-        if movie_show and start_timecode and end_timecode:
-            if timeline_placement:
-                last_scene_timeline = timeline_placement
-            else:
-                timeline_placement = last_scene_timeline
-            if comment:
-                last_scene_comment = comment
-            else:
-                comment = last_scene_comment
-            if audio_title:
-                last_scene_audio_title = audio_title
-            else:
-                audio_title = last_scene_audio_title
+        if timeline_placement:
+            last_scene_timeline = timeline_placement
         else:
-            # Not a valid scene row, do not update last_scene values
-            if not timeline_placement:
-                timeline_placement = last_scene_timeline
-            if not comment:
-                comment = last_scene_comment
-            if not audio_title:
-                audio_title = last_scene_audio_title
+            timeline_placement = last_scene_timeline
+        if comment:
+            last_scene_comment = comment
+        else:
+            comment = last_scene_comment
+        if audio_title:
+            last_scene_audio_title = audio_title
+        else:
+            audio_title = last_scene_audio_title
+
+        # If timeline_placement is just a month, attach the most recent section header year above
+        if current_year and is_month(timeline_placement):
+            timeline_placement = f"{timeline_placement} {current_year}"
 
-        # If timeline_placement is just a month, search upwards for the most recent section header year
-        if month_pattern.fullmatch(timeline_placement):
-            year_found = None
-            for prev_idx in range(idx-1, -1, -1):
-                prev_row = df.iloc[prev_idx]
-                possible_year = str(prev_row[1]).strip()
-                if year_pattern.fullmatch(possible_year):
-                    year_found = possible_year
-                    break
-            if year_found:
-                timeline_placement = f"{timeline_placement} {year_found}"
+        # Track section header years as we go so month-only cells resolve in a single pass
+        if is_year(movie_show):
+            current_year = movie_show
 
-        # Only extract rows with Movie/Show, start and end timecodes, and timeline placement
-        if movie_show and start_timecode and end_timecode and timeline_placement:
+        # Only extract rows that also have a timeline placement
+        if timeline_placement:
             scene_dict = {
                 'movie_show': movie_show,
                 'season_episode': season_episode,
@@ -90,7 +114,7 @@ def extract_scenes(csv_path: str) -> List[Dict[str, Optional[str]]]:
             if audio_title:
                 scene_dict['audio_title'] = audio_title
                 
-            scenes.append(scene_dict)
-    if not scenes:
-        print('DEBUG: First 2 rows:', [tuple(df.iloc[i]) for i in range(min(2, len(df)))])
-    return scenes 
\ No newline at end of file
+            found = True
+            yield scene_dict
+    if not found:
+        print('DEBUG: First 2 rows:', first_rows)
\ No newline at end of file
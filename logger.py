@@ -1,10 +1,23 @@
 import os
 import sys
-import logging
-from datetime import datetime
-from collections import deque
-from typing import Optional, TextIO
 import threading
+import queue
+import time
+import re
+
+# How long a get_log_file_size() result is reused before re-statting the log file
+LOG_SIZE_TTL = 0.25
+
+# FFmpeg banner/stream lines worth copying into the log
+FFMPEG_RE = re.compile(r'input #|stream #|codec|duration:|bitrate:', re.IGNORECASE)
+
+# Number of recent output lines kept in the ring buffer (must be a power of two)
+RECENT_RING_SIZE = 512
+RECENT_RING_MASK = RECENT_RING_SIZE - 1
+
+# Maximum number of formatted records the writer thread joins into one write()
+WRITE_BATCH_SIZE = 64
+
 
 class ProgressLogger:
     """
@@ -15,71 +28,135 @@ class ProgressLogger:
     def __init__(self, log_file: str = "mega_cut.log", max_recent_chars: int = 120):
         self.log_file = log_file
         self.max_recent_chars = max_recent_chars
-        self.recent_output = deque(maxlen=500)  # Keep last 500 lines for recent output
+        # Keep the last RECENT_RING_SIZE lines for recent output. Several threads
+        # log at once, so the slot write and the index update happen under one lock.
+        self._ring = [None] * RECENT_RING_SIZE
+        self._ring_idx = 0  # one past the most recently written slot
+        self._ring_lock = threading.Lock()
         self.lock = threading.Lock()
+        self._size_cache = (0, float('-inf'))  # (size in bytes, monotonic time of the stat)
+        self._timestamp_cache = (-1, '')  # (epoch second, formatted '%H:%M:%S')
         
-        # Set up logging
-        self.logger = logging.getLogger('mega_cut')
-        self.logger.setLevel(logging.INFO)
-        
-        # Clear any existing handlers
-        self.logger.handlers.clear()
-        
-        # File handler
-        file_handler = logging.FileHandler(log_file, mode='w', encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
-        
-        # Custom formatter with timestamps
-        formatter = logging.Formatter(
-            '%(asctime)s | %(levelname)s | %(message)s',
-            datefmt='%H:%M:%S'
-        )
-        file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        # Log lines are formatted by the caller and written on a background thread
+        self._q = queue.SimpleQueue()
+        self._closing = False  # set by close(); later log calls are ignored
+        self._log_stream = open(log_file, mode='w', encoding='utf-8')
+        self._writer = threading.Thread(target=self._writer_loop, name='mega_cut-log-writer', daemon=True)
+        self._writer.start()
         
         # Initialize log file
-        self.logger.info("=== Marvel Mega Cut Processing Started ===")
+        self._write('INFO', "=== Marvel Mega Cut Processing Started ===")
+    
+    def _writer_loop(self):
+        """Drain queued records and write them to the log file in batches."""
+        q = self._q
+        stream = self._log_stream
+        done = False
+        try:
+            while not done:
+                batch = []
+                record = q.get()
+                while True:
+                    # Shutdown sentinel; records other threads queue behind it are dropped
+                    if record is None:
+                        done = True
+                        break
+                    batch.append(record)
+                    if len(batch) >= WRITE_BATCH_SIZE:
+                        break
+                    try:
+                        record = q.get_nowait()
+                    except queue.Empty:
+                        break
+                if batch:
+                    stream.write(''.join(batch))
+                    stream.flush()
+        finally:
+            stream.close()
         
+    def _timestamp(self) -> str:
+        """Current wall-clock time as '%H:%M:%S', formatted at most once per second."""
+        now = time.time()
+        second = int(now)
+        cached_second, formatted = self._timestamp_cache
+        if second != cached_second:
+            formatted = time.strftime('%H:%M:%S', time.localtime(now))
+            self._timestamp_cache = (second, formatted)
+        return formatted
+    
+    def _write(self, level: str, message: str):
+        """Queue one '<time> | <level> | <message>' line for the writer thread."""
+        self._put_record(f"{self._timestamp()} | {level} | {message}\n")
+    
+    def _put_record(self, record: str):
+        """Queue preformatted log text (one or more full lines) as a single write."""
+        if self._closing:
+            return
+        self._q.put(record)
+    
+    def _append_recent(self, line: str):
+        """Store a line in the recent-output ring."""
+        with self._ring_lock:
+            idx = self._ring_idx
+            self._ring[idx & RECENT_RING_MASK] = line
+            self._ring_idx = idx + 1
+    
     def log_info(self, message: str):
         """Log an info message."""
-        with self.lock:
-            self.logger.info(message)
-            self.recent_output.append(f"INFO: {message}")
+        self._write('INFO', message)
+        self._append_recent(f"INFO: {message}")
     
     def log_warning(self, message: str):
         """Log a warning message."""
-        with self.lock:
-            self.logger.warning(message)
-            self.recent_output.append(f"WARN: {message}")
+        self._write('WARNING', message)
+        self._append_recent(f"WARN: {message}")
     
     def log_error(self, message: str):
         """Log an error message."""
-        with self.lock:
-            self.logger.error(message)
-            self.recent_output.append(f"ERROR: {message}")
+        self._write('ERROR', message)
+        self._append_recent(f"ERROR: {message}")
     
     def log_ffmpeg_output(self, output: str):
         """Log FFmpeg output (usually verbose technical details)."""
-        with self.lock:
-            # Split into lines and log each
-            for line in output.strip().split('\n'):
-                if line.strip():
-                    self.logger.info(f"FFMPEG: {line.strip()}")
-                    self.recent_output.append(line.strip())
+        # Split into lines once, then queue them together as one record; every
+        # line still gets its own '<time> | INFO |' prefix like the rest of the log
+        lines = [line.strip() for line in output.strip().split('\n') if line.strip()]
+        if not lines:
+            return
+        prefix = f"{self._timestamp()} | INFO | FFMPEG: "
+        self._put_record(''.join(f"{prefix}{line}\n" for line in lines))
+        for line in lines:
+            self._append_recent(line)
     
     def get_recent_output(self) -> str:
         """Get the last max_recent_chars characters from recent output."""
-        with self.lock:
-            # Join recent lines and get last N characters
-            recent_text = ' '.join(self.recent_output)
-            if len(recent_text) <= self.max_recent_chars:
-                return recent_text
-            return '...' + recent_text[-self.max_recent_chars:]
+        ring = self._ring
+        # Walk back from the newest slot only until we have enough characters
+        tail = []
+        length = -1  # no separator before the first line
+        with self._ring_lock:
+            idx = self._ring_idx
+            available = min(idx, RECENT_RING_SIZE)
+            for i in range(idx - 1, idx - 1 - available, -1):
+                line = ring[i & RECENT_RING_MASK]
+                tail.append(line)
+                length += len(line) + 1
+                if length >= self.max_recent_chars:
+                    break
+        truncated = len(tail) < available
+        recent_text = ' '.join(reversed(tail))
+        if not truncated and len(recent_text) <= self.max_recent_chars:
+            return recent_text
+        return '...' + recent_text[-self.max_recent_chars:]
     
     def get_log_file_size(self) -> str:
         """Get formatted log file size."""
         try:
-            size_bytes = os.path.getsize(self.log_file)
+            size_bytes, checked_at = self._size_cache
+            now = time.monotonic()
+            if now - checked_at >= LOG_SIZE_TTL:
+                size_bytes = os.path.getsize(self.log_file)
+                self._size_cache = (size_bytes, now)
             if size_bytes < 1024:
                 return f"{size_bytes} B"
             elif size_bytes < 1024 * 1024:
@@ -90,12 +167,15 @@ class ProgressLogger:
             return "0 B"
     
     def close(self):
-        """Close the logger and clean up handlers."""
+        """Close the logger and stop the writer thread."""
         with self.lock:
-            self.logger.info("=== Marvel Mega Cut Processing Completed ===")
-            for handler in self.logger.handlers:
-                handler.close()
-            self.logger.handlers.clear()
+            if not self._writer.is_alive():
+                return
+            self._write('INFO', "=== Marvel Mega Cut Processing Completed ===")
+            self._closing = True
+            # Let the writer flush everything queued so far, then stop it
+            self._q.put(None)
+            self._writer.join()
 
 
 class OutputRedirector:
@@ -108,15 +188,16 @@ class OutputRedirector:
         self.logger = logger
         self.stream_name = stream_name
         self.original_stream = None
-        self.redirected_output = []
+        # Bound once here since write() runs for every chunk MoviePy/FFmpeg prints
+        self._is_ffmpeg_output = FFMPEG_RE.search
     
     def write(self, text: str):
         """Capture written text."""
-        if text.strip():
-            self.redirected_output.append(text)
-            # Log FFmpeg-like output
-            if any(keyword in text.lower() for keyword in ['input #', 'stream #', 'codec', 'duration:', 'bitrate:']):
-                self.logger.log_ffmpeg_output(text)
+        if not text or text.isspace():
+            return
+        # Log FFmpeg-like output
+        if self._is_ffmpeg_output(text):
+            self.logger.log_ffmpeg_output(text)
     
     def flush(self):
         """Flush method required for file-like object."""
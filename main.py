@@ -1,8 +1,13 @@
 import os
+import csv
+import itertools
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import click
-import pandas as pd
 from dotenv import load_dotenv
-from csv_parser import extract_scenes as extract_old_scenes
+from rich.console import Console
+from csv_parser import extract_scenes as extract_old_scenes, extract_scenes_from_reader as extract_old_scenes_from_reader
 from new_csv_parser import extract_scenes as extract_new_scenes
 from video_editor import process_scenes, process_scenes_with_options, parse_chunk_selection
 from csv_migrator import migrate_csv, validate_migration
@@ -11,36 +16,48 @@ from mkv_analyzer import MKVAnalyzer
 # Load .env if present
 load_dotenv()
 
-def detect_csv_format(csv_path: str) -> str:
-    """
-    Detect whether CSV is in old or new format.
-    Returns 'old' or 'new'.
-    """
-    try:
-        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
-        
-        # Check if new format columns exist
-        new_format_columns = ['movie_show', 'start_timecode', 'end_timecode', 'timeline_placement']
-        if all(col in df.columns for col in new_format_columns):
-            return 'new'
-        else:
-            return 'old'
-    except Exception:
-        # If we can't read with headers, assume old format
-        return 'old'
+# Shared by every command so the terminal is only probed once
+CONSOLE = Console()
+
+# Columns whose presence in the header row marks the new CSV format
+NEW_FORMAT_COLUMNS = frozenset(['movie_show', 'start_timecode', 'end_timecode', 'timeline_placement'])
+
+def _classify_header(header) -> str:
+    """Return 'new' if the header row has every new-format column, else 'old'."""
+    # Check if new format columns exist
+    if NEW_FORMAT_COLUMNS.issubset(header):
+        return 'new'
+    return 'old'
 
 def extract_scenes(csv_path: str):
     """
     Extract scenes using the appropriate parser based on CSV format.
+    The header row picks the parser. New-format files go through
+    new_csv_parser.extract_scenes so repeat loads hit its cache; old-format
+    files continue on the same reader.
     """
-    format_type = detect_csv_format(csv_path)
+    with open(csv_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        is_new_format = header is not None and _classify_header(header) == 'new'
+        if not is_new_format:
+            print(f"[cyan]Detected old CSV format[/cyan]")
+            rows = itertools.chain([header], reader) if header is not None else reader
+            return list(extract_old_scenes_from_reader(rows))
     
-    if format_type == 'new':
-        print(f"[cyan]Detected new CSV format[/cyan]")
-        return extract_new_scenes(csv_path)
-    else:
-        print(f"[cyan]Detected old CSV format[/cyan]")
-        return extract_old_scenes(csv_path)
+    print(f"[cyan]Detected new CSV format[/cyan]")
+    return extract_new_scenes(csv_path)
+
+def extract_scenes_batch(paths):
+    """
+    Extract scenes from several CSV files, parsing them in parallel worker processes.
+    Returns a dict mapping each path to its list of scenes, in the order given.
+    """
+    paths = list(paths)
+    if len(paths) <= 1:
+        return {path: extract_scenes(path) for path in paths}
+    with ProcessPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as executor:
+        return dict(zip(paths, executor.map(extract_scenes, paths)))
 
 def set_movie_audio_track(csv_path: str, movie_name: str, audio_track: str) -> bool:
     """
@@ -55,29 +72,54 @@ def set_movie_audio_track(csv_path: str, movie_name: str, audio_track: str) -> b
         bool: True if successful, False otherwise
     """
     try:
-        # Read the CSV file
-        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+        # Stream rows into a temp file next to the CSV; memory stays flat however large it is
+        with open(csv_path, newline='', encoding='utf-8-sig') as src:
+            reader = csv.reader(src)
+            header = next(reader, [])
+            
+            # Check if this is the new format (has audio_title column)
+            if 'audio_title' not in header:
+                print(f"[red]Error: CSV file does not have an 'audio_title' column. This feature requires the new CSV format.[/red]")
+                return False
+            movie_index = header.index('movie_show')
+            audio_index = header.index('audio_title')
+            width = len(header)
+            
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(csv_path)), suffix='.tmp')
+            try:
+                match_count = 0
+                target = movie_name.casefold()
+                with os.fdopen(fd, 'w', newline='', encoding='utf-8') as dst:
+                    writer = csv.writer(dst, lineterminator=os.linesep)
+                    writer.writerow(header)
+                    for row in reader:
+                        if not row:
+                            continue
+                        if len(row) < width:
+                            row += [''] * (width - len(row))
+                        # Update the audio_title field for rows where movie_show matches the target movie
+                        if row[movie_index].strip().casefold() == target:
+                            row[audio_index] = audio_track
+                            match_count += 1
+                        writer.writerow(row)
+                
+                if match_count == 0:
+                    print(f"[yellow]Warning: No scenes found for movie '{movie_name}'[/yellow]")
+                    os.remove(tmp_path)
+                    return False
+            except BaseException:
+                os.remove(tmp_path)
+                raise
         
-        # Check if this is the new format (has audio_title column)
-        if 'audio_title' not in df.columns:
-            print(f"[red]Error: CSV file does not have an 'audio_title' column. This feature requires the new CSV format.[/red]")
-            return False
-        
-        # Find rows where movie_show matches the target movie
-        movie_mask = df['movie_show'].str.strip().str.lower() == movie_name.lower()
-        matching_rows = df[movie_mask]
-        
-        if len(matching_rows) == 0:
-            print(f"[yellow]Warning: No scenes found for movie '{movie_name}'[/yellow]")
-            return False
-        
-        # Update the audio_title field for matching rows
-        df.loc[movie_mask, 'audio_title'] = audio_track
-        
-        # Save the updated CSV
-        df.to_csv(csv_path, index=False)
+        # Save the updated CSV; mkstemp creates the temp file 0600, so give it the original's mode first
+        try:
+            shutil.copymode(csv_path, tmp_path)
+            os.replace(tmp_path, csv_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
         
-        print(f"[green]Successfully updated audio track to '{audio_track}' for {len(matching_rows)} scenes of '{movie_name}'[/green]")
+        print(f"[green]Successfully updated audio track to '{audio_track}' for {match_count} scenes of '{movie_name}'[/green]")
         return True
         
     except Exception as e:
@@ -100,8 +142,7 @@ def cli():
 def process(csv_path, output_folder, movie_folder, chunks_str, verbose, no_threading, max_workers):
     """Process scenes into chronological mega cuts."""
     # Create a Rich console for all output
-    from rich.console import Console
-    console = Console()
+    console = CONSOLE
     
     # Get env vars if CLI not provided
     csv_path = csv_path or os.getenv('MEGA_CUT_CSV')
@@ -153,8 +194,7 @@ def process(csv_path, output_folder, movie_folder, chunks_str, verbose, no_threa
 @click.option('--audio-title', default='Original Audio', help='Default audio title for all scenes')
 def migrate(old_csv_path, new_csv_path, language, audio_title):
     """Migrate from old CSV format to new simplified format with language and audio support."""
-    from rich.console import Console
-    console = Console()
+    console = CONSOLE
     
     console.print(f"[cyan]Migrating CSV from old format to new format...[/cyan]")
     console.print(f"[cyan]Old CSV:[/cyan] {old_csv_path}")
@@ -163,12 +203,20 @@ def migrate(old_csv_path, new_csv_path, language, audio_title):
     console.print(f"[cyan]Default Audio Title:[/cyan] {audio_title}")
     console.print()
     
+    # Parse the old CSV once and share the scenes between migration and validation
+    try:
+        old_scenes = extract_old_scenes(old_csv_path)
+    except Exception as e:
+        console.print(f"[red]Error extracting scenes from old CSV: {e}[/red]")
+        exit(1)
+    
     # Perform migration
-    success = migrate_csv(old_csv_path, new_csv_path, language, audio_title)
+    stats = {}
+    success = migrate_csv(old_csv_path, new_csv_path, language, audio_title, old_scenes=old_scenes, out_stats=stats)
     
     if success:
-        # Validate migration
-        validate_migration(old_csv_path, new_csv_path)
+        # Validate migration against the digest recorded while writing
+        validate_migration(old_csv_path, new_csv_path, old_scenes=old_scenes, stats=stats)
         console.print("\n[green]🎉 Migration completed successfully![/green]")
         console.print(f"[cyan]New CSV saved to:[/cyan] {new_csv_path}")
     else:
@@ -180,20 +228,18 @@ def migrate(old_csv_path, new_csv_path, language, audio_title):
 def create_sample(output_path):
     """Create a sample CSV file with the new structure."""
     from new_csv_parser import create_sample_csv
-    from rich.console import Console
-    console = Console()
+    console = CONSOLE
     
     console.print(f"[cyan]Creating sample CSV with new structure...[/cyan]")
     create_sample_csv(output_path)
     console.print(f"[green]✅ Sample CSV created:[/green] {output_path}")
 
 @cli.command()
-@click.option('--csv', 'csv_path', default=None, help='Path to the scenes CSV file')
+@click.option('--csv', 'csv_path', default=None, help='Path to the scenes CSV file, or a folder of CSV files')
 @click.option('--movies', 'movie_folder', default=None, help='Path to the folder containing movie/show files')
 def analyze_languages(csv_path, movie_folder):
     """Analyze MKV files to identify available audio languages for movies in the CSV."""
-    from rich.console import Console
-    console = Console()
+    console = CONSOLE
     
     # Get env vars if CLI not provided
     csv_path = csv_path or os.getenv('MEGA_CUT_CSV')
@@ -208,11 +254,15 @@ def analyze_languages(csv_path, movie_folder):
     console.print(f"[cyan]Movie folder:[/cyan] {movie_folder}")
     console.print()
 
-    # Extract unique movie names from CSV
+    # Extract unique movie names from CSV (or every CSV in a folder)
     try:
-        scenes = extract_scenes(csv_path)
-        movie_names = list(set(scene['movie_show'] for scene in scenes))
-        movie_names.sort()  # Sort alphabetically
+        if os.path.isdir(csv_path):
+            csv_paths = sorted(entry.path for entry in os.scandir(csv_path)
+                               if entry.is_file() and entry.name.lower().endswith('.csv'))
+            scenes = [scene for file_scenes in extract_scenes_batch(csv_paths).values() for scene in file_scenes]
+        else:
+            scenes = extract_scenes(csv_path)
+        movie_names = sorted({scene['movie_show'] for scene in scenes})  # Sort alphabetically
         
         console.print(f"[green]Found {len(movie_names)} unique movies in CSV:[/green]")
         for movie in movie_names:
@@ -224,7 +274,7 @@ def analyze_languages(csv_path, movie_folder):
         exit(1)
 
     # Analyze MKV files
-    analyzer = MKVAnalyzer()
+    analyzer = MKVAnalyzer(console=console)
     movie_languages = analyzer.analyze_movie_folder(movie_folder, movie_names)
     
     # Display results
@@ -255,8 +305,7 @@ def set_audio_track(csv_path, movie_name, audio_track):
     MOVIE_NAME: Name of the movie to update (case-insensitive)
     AUDIO_TRACK: Audio track title to set (e.g., "English (Vegamovies.NL) [8ch]")
     """
-    from rich.console import Console
-    console = Console()
+    console = CONSOLE
     
     console.print(f"[cyan]Setting audio track for movie scenes...[/cyan]")
     console.print(f"[cyan]CSV file:[/cyan] {csv_path}")
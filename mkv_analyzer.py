@@ -1,23 +1,349 @@
 import os
 import subprocess
 import json
+import hashlib
+import functools
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Tuple
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
+# ffprobe language codes and their display names
+LANGUAGE_MAP = {
+    'eng': 'English',
+    'spa': 'Spanish',
+    'fra': 'French',
+    'deu': 'German',
+    'ita': 'Italian',
+    'por': 'Portuguese',
+    'rus': 'Russian',
+    'jpn': 'Japanese',
+    'kor': 'Korean',
+    'chi': 'Chinese',
+    'ara': 'Arabic',
+    'hin': 'Hindi',
+    'unknown': 'Unknown'
+}
+
+def _probe_workers_from_env() -> int:
+    """
+    Upper bound on concurrent ffprobe processes in analyze_movie_folder. The threads
+    only wait on subprocesses, so several per core; MEGA_CUT_PROBE_WORKERS overrides
+    it (e.g. 1 in CI). Unparseable values fall back to the default, and it's at least 1.
+    """
+    default = min(32, (os.cpu_count() or 1) * 4)
+    try:
+        workers = int(os.getenv('MEGA_CUT_PROBE_WORKERS', default))
+    except ValueError:
+        workers = default
+    return max(1, workers)
+
+MAX_PROBE_WORKERS = _probe_workers_from_env()
+
+# ffprobe output is cached here, one JSON file per (path, mtime, size) of the probed MKV
+FFPROBE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'marvel-mega-cut', 'ffprobe')
+
+def _normalize_movie_name(name: str) -> str:
+    """
+    Fold the naming variations seen in movie files ('Thor: X', 'Thor X', 'Thor - X',
+    'A & B' vs 'A and B', .mkv vs .MKV casing) onto one lookup key.
+    """
+    return name.lower().replace(':', '').replace('&', 'and').replace(' -', '').strip()
+
+# Matroska element IDs needed to read track metadata without ffprobe
+EBML_HEADER_ID = 0x1A45DFA3
+EBML_DOCTYPE_ID = 0x4282
+SEGMENT_ID = 0x18538067
+SEEK_HEAD_ID = 0x114D9B74
+SEEK_ID = 0x4DBB
+SEEK_ID_ID = 0x53AB
+SEEK_POSITION_ID = 0x53AC
+TRACKS_ID = 0x1654AE6B
+CLUSTER_ID = 0x1F43B675
+TRACK_ENTRY_ID = 0xAE
+TRACK_TYPE_ID = 0x83
+CODEC_ID_ID = 0x86
+LANGUAGE_ID = 0x22B59C
+NAME_ID = 0x536E
+AUDIO_ID = 0xE1
+CHANNELS_ID = 0x9F
+TRACK_TYPE_AUDIO = 2
+
+# Matroska CodecID -> the codec_name ffprobe reports (prefix match for the A_AAC/... families)
+MATROSKA_AUDIO_CODECS = {
+    'A_AAC': 'aac',
+    'A_AC3': 'ac3',
+    'A_EAC3': 'eac3',
+    'A_DTS': 'dts',
+    'A_TRUEHD': 'truehd',
+    'A_OPUS': 'opus',
+    'A_FLAC': 'flac',
+    'A_VORBIS': 'vorbis',
+    'A_MPEG/L3': 'mp3',
+    'A_MPEG/L2': 'mp2',
+}
+
+class _EBMLError(Exception):
+    """Raised when a file can't be read as Matroska by the fast path."""
+
+def _read_vint(f, keep_marker: bool) -> Tuple[int, int]:
+    """Read an EBML variable-length integer; returns (value, length in bytes)."""
+    first = f.read(1)
+    if not first:
+        raise _EBMLError("unexpected end of file")
+    byte = first[0]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not byte & mask:
+        length += 1
+        mask >>= 1
+    if length > 8:
+        raise _EBMLError("invalid variable-length integer")
+    rest = f.read(length - 1)
+    if len(rest) != length - 1:
+        raise _EBMLError("unexpected end of file")
+    value = byte if keep_marker else byte & (mask - 1)
+    for b in rest:
+        value = (value << 8) | b
+    return value, length
+
+def _read_element_header(f) -> Tuple[int, Optional[int]]:
+    """Read an element ID and data size; the size is None when it is 'unknown'."""
+    element_id, _ = _read_vint(f, keep_marker=True)
+    size, length = _read_vint(f, keep_marker=False)
+    if size == (1 << (7 * length)) - 1:
+        size = None
+    return element_id, size
+
+def _iter_children(f, end: int):
+    """Yield (id, data offset, size) for each child element up to byte offset end."""
+    while f.tell() < end:
+        element_id, size = _read_element_header(f)
+        offset = f.tell()
+        if size is None:
+            raise _EBMLError("unknown-size child element")
+        yield element_id, offset, size
+        f.seek(offset + size)
+
+def _read_uint(f, size: int) -> int:
+    return int.from_bytes(f.read(size), 'big')
+
+def _read_string(f, size: int) -> str:
+    return f.read(size).split(b'\0', 1)[0].decode('utf-8', 'replace')
+
+def _probe_ebml(mkv_path: str) -> Optional[List[Dict[str, str]]]:
+    """
+    Read audio track metadata straight from the Matroska Tracks element.
+    Returns tracks in the same shape as get_audio_languages, or None whenever
+    the file isn't plain Matroska we understand (the caller then uses ffprobe).
+    """
+    try:
+        with open(mkv_path, 'rb') as f:
+            file_size = os.fstat(f.fileno()).st_size
+            
+            # EBML header: only accept Matroska/WebM documents
+            element_id, size = _read_element_header(f)
+            if element_id != EBML_HEADER_ID or size is None:
+                return None
+            doc_type = None
+            for child_id, offset, child_size in _iter_children(f, f.tell() + size):
+                if child_id == EBML_DOCTYPE_ID:
+                    doc_type = _read_string(f, child_size)
+            if doc_type not in ('matroska', 'webm'):
+                return None
+            
+            element_id, size = _read_element_header(f)
+            if element_id != SEGMENT_ID:
+                return None
+            segment_start = f.tell()
+            segment_end = file_size if size is None else min(file_size, segment_start + size)
+            
+            # Find Tracks among the top-level elements, via the SeekHead if it sits past the clusters
+            tracks_offset = None
+            seek_tracks_position = None
+            for child_id, offset, child_size in _iter_children(f, segment_end):
+                if child_id == TRACKS_ID:
+                    tracks_offset = (offset, child_size)
+                    break
+                if child_id == SEEK_HEAD_ID and seek_tracks_position is None:
+                    for seek_id, seek_offset, seek_size in _iter_children(f, offset + child_size):
+                        if seek_id != SEEK_ID:
+                            continue
+                        target_id = target_position = None
+                        for entry_id, entry_offset, entry_size in _iter_children(f, seek_offset + seek_size):
+                            if entry_id == SEEK_ID_ID:
+                                target_id = _read_uint(f, entry_size)
+                            elif entry_id == SEEK_POSITION_ID:
+                                target_position = _read_uint(f, entry_size)
+                        if target_id == TRACKS_ID and target_position is not None:
+                            seek_tracks_position = target_position
+                if child_id == CLUSTER_ID:
+                    break
+            if tracks_offset is None:
+                if seek_tracks_position is None:
+                    return None
+                f.seek(segment_start + seek_tracks_position)
+                element_id, size = _read_element_header(f)
+                if element_id != TRACKS_ID or size is None:
+                    return None
+                tracks_offset = (f.tell(), size)
+            
+            # Walk the TrackEntry elements; the stream index is the track's position in the file
+            audio_tracks = []
+            f.seek(tracks_offset[0])
+            entries = [(offset, size) for entry_id, offset, size in _iter_children(f, sum(tracks_offset))
+                       if entry_id == TRACK_ENTRY_ID]
+            for stream_index, (entry_offset, entry_size) in enumerate(entries):
+                f.seek(entry_offset)
+                track_type = None
+                codec_id = ''
+                language = 'eng'  # Matroska's default when the element is absent
+                name = ''
+                channels = 1
+                for child_id, offset, child_size in _iter_children(f, entry_offset + entry_size):
+                    if child_id == TRACK_TYPE_ID:
+                        track_type = _read_uint(f, child_size)
+                    elif child_id == CODEC_ID_ID:
+                        codec_id = _read_string(f, child_size)
+                    elif child_id == LANGUAGE_ID:
+                        language = _read_string(f, child_size)
+                    elif child_id == NAME_ID:
+                        name = _read_string(f, child_size)
+                    elif child_id == AUDIO_ID:
+                        for audio_id, audio_offset, audio_size in _iter_children(f, offset + child_size):
+                            if audio_id == CHANNELS_ID:
+                                channels = _read_uint(f, audio_size)
+                if track_type != TRACK_TYPE_AUDIO:
+                    continue
+                codec = next((codec_name for prefix, codec_name in MATROSKA_AUDIO_CODECS.items()
+                              if codec_id.startswith(prefix)), None)
+                if codec is None:
+                    # Codec naming we can't match to ffprobe's; let ffprobe describe the file
+                    return None
+                audio_tracks.append({
+                    'index': str(stream_index),
+                    'language': language if language and language != 'und' else 'unknown',
+                    'title': name,
+                    'codec': codec,
+                    'channels': str(channels),
+                })
+            return audio_tracks
+    except (OSError, _EBMLError):
+        return None
+
+def _stat_key(mkv_path: str) -> Optional[Tuple[str, int, int]]:
+    """Return (absolute path, mtime_ns, size) identifying the file's current contents, or None if it can't be stat'ed."""
+    try:
+        st = os.stat(mkv_path)
+    except OSError:
+        return None
+    return os.path.abspath(mkv_path), st.st_mtime_ns, st.st_size
+
+def _ffprobe_cache_path(mkv_path: str) -> Optional[str]:
+    """Return the cache file for the file's current contents, or None if it can't be stat'ed."""
+    stat_key = _stat_key(mkv_path)
+    if stat_key is None:
+        return None
+    key = '|'.join(map(str, stat_key))
+    return os.path.join(FFPROBE_CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+def _read_ffprobe_cache(cache_path: Optional[str]) -> Optional[bytes]:
+    """Return cached ffprobe output, or None on a miss."""
+    if cache_path is None:
+        return None
+    try:
+        with open(cache_path, 'rb') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _write_ffprobe_cache(cache_path: Optional[str], output: bytes):
+    """Atomically store ffprobe output; caching is best-effort, so failures are ignored."""
+    if cache_path is None:
+        return
+    try:
+        os.makedirs(FFPROBE_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=FFPROBE_CACHE_DIR, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(output)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            os.remove(tmp_path)
+            raise
+    except OSError:
+        pass
+
+def _read_audio_tracks(mkv_path: str) -> List[Dict[str, str]]:
+    """
+    Read the audio tracks from the Matroska header, falling back to ffprobe.
+    Errors from ffprobe or its output are raised for the caller to report.
+    """
+    # Fast path: read the track list from the Matroska header ourselves
+    audio_tracks = _probe_ebml(mkv_path)
+    if audio_tracks is not None:
+        return audio_tracks
+    
+    # Reuse a previous ffprobe run if the file hasn't changed since
+    cache_path = _ffprobe_cache_path(mkv_path)
+    output = _read_ffprobe_cache(cache_path)
+    if output is None:
+        # Use ffprobe to get detailed audio stream information
+        cmd = [
+            'ffprobe',
+            '-v', 'quiet',
+            '-print_format', 'json',
+            '-select_streams', 'a',  # Only audio streams
+            # Only the fields read below, instead of every stream property
+            '-show_entries', 'stream=index,codec_name,channels:stream_tags=language,title',
+            mkv_path
+        ]
+        
+        # Keep stdout as bytes: json.loads decodes UTF-8 JSON itself, and the cache stores it as-is
+        result = subprocess.run(cmd, capture_output=True, check=True)
+        output = result.stdout
+        data = json.loads(output)
+        _write_ffprobe_cache(cache_path, output)
+    else:
+        data = json.loads(output)
+    
+    audio_tracks = []
+    for stream in data.get('streams', []):
+        track_info = {
+            'index': str(stream.get('index', '')),
+            'language': stream.get('tags', {}).get('language', 'unknown'),
+            'title': stream.get('tags', {}).get('title', ''),
+            'codec': stream.get('codec_name', ''),
+            'channels': str(stream.get('channels', '')),
+        }
+        audio_tracks.append(track_info)
+    
+    return audio_tracks
+
+@functools.lru_cache(maxsize=256)
+def _probe_audio_tracks(mkv_path: str, mtime_ns: int, size: int) -> Tuple[Dict[str, str], ...]:
+    """
+    In-process memo of _read_audio_tracks. mtime_ns and size are only part of
+    the key, so a re-muxed file misses and is read again. Failures raise and
+    are therefore never cached.
+    """
+    return tuple(_read_audio_tracks(mkv_path))
+
 class MKVAnalyzer:
     """
     Analyzes MKV files to extract audio language information.
     Uses ffprobe to get detailed audio track information.
     """
     
-    def __init__(self):
-        self.console = Console()
+    def __init__(self, console: Optional[Console] = None):
+        self.console = console or Console()
     
     def get_audio_languages(self, mkv_path: str) -> List[Dict[str, str]]:
         """
-        Extract audio language information from an MKV file using ffprobe.
+        Extract audio language information from an MKV file, reading the Matroska
+        track headers directly and falling back to ffprobe.
         
         Returns a list of dictionaries with keys:
         - index: Audio track index
@@ -30,31 +356,15 @@ class MKVAnalyzer:
             return []
         
         try:
-            # Use ffprobe to get detailed audio stream information
-            cmd = [
-                'ffprobe',
-                '-v', 'quiet',
-                '-print_format', 'json',
-                '-show_streams',
-                '-select_streams', 'a',  # Only audio streams
-                mkv_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            data = json.loads(result.stdout)
-            
-            audio_tracks = []
-            for stream in data.get('streams', []):
-                track_info = {
-                    'index': str(stream.get('index', '')),
-                    'language': stream.get('tags', {}).get('language', 'unknown'),
-                    'title': stream.get('tags', {}).get('title', ''),
-                    'codec': stream.get('codec_name', ''),
-                    'channels': str(stream.get('channels', '')),
-                }
-                audio_tracks.append(track_info)
+            # Files that can be stat'ed are memoized on their contents for the life of the process
+            stat_key = _stat_key(mkv_path)
+            if stat_key is None:
+                audio_tracks = _read_audio_tracks(mkv_path)
+            else:
+                audio_tracks = _probe_audio_tracks(*stat_key)
             
-            return audio_tracks
+            # Copies, so callers can't modify the memoized tracks
+            return [dict(track) for track in audio_tracks]
             
         except FileNotFoundError:
             self.console.print(f"[red]Error: ffprobe not found. Please install FFmpeg and ensure ffprobe is in your PATH.[/red]")
@@ -67,7 +377,7 @@ class MKVAnalyzer:
         except subprocess.CalledProcessError as e:
             self.console.print(f"[red]Error running ffprobe on {mkv_path}: {e}[/red]")
             if e.stderr:
-                self.console.print(f"[red]ffprobe stderr: {e.stderr}[/red]")
+                self.console.print(f"[red]ffprobe stderr: {e.stderr.decode('utf-8', 'replace')}[/red]")
             return []
         except json.JSONDecodeError as e:
             self.console.print(f"[red]Error parsing ffprobe output for {mkv_path}: {e}[/red]")
@@ -76,24 +386,11 @@ class MKVAnalyzer:
             self.console.print(f"[red]Unexpected error analyzing {mkv_path}: {e}[/red]")
             return []
     
-    def format_language_display(self, language_code: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def format_language_display(language_code: str) -> str:
         """Convert language code to human-readable format."""
-        language_map = {
-            'eng': 'English',
-            'spa': 'Spanish',
-            'fra': 'French',
-            'deu': 'German',
-            'ita': 'Italian',
-            'por': 'Portuguese',
-            'rus': 'Russian',
-            'jpn': 'Japanese',
-            'kor': 'Korean',
-            'chi': 'Chinese',
-            'ara': 'Arabic',
-            'hin': 'Hindi',
-            'unknown': 'Unknown'
-        }
-        return language_map.get(language_code.lower(), language_code.upper())
+        return LANGUAGE_MAP.get(language_code.lower(), language_code.upper())
     
     def analyze_movie_folder(self, movie_folder: str, movie_names: List[str]) -> Dict[str, List[Dict[str, str]]]:
         """
@@ -113,31 +410,37 @@ class MKVAnalyzer:
             self.console.print(f"[red]Error: Movie folder does not exist: {movie_folder}[/red]")
             return results
         
+        # List the folder once and index its MKV files by exact and normalized name
+        exact_files = {}
+        normalized_files = {}
+        try:
+            with os.scandir(movie_folder) as entries:
+                for entry in entries:
+                    stem, ext = os.path.splitext(entry.name)
+                    if ext.lower() != '.mkv' or not entry.is_file():
+                        continue
+                    exact_files[stem] = entry.path
+                    normalized_files.setdefault(_normalize_movie_name(stem), entry.path)
+        except OSError as e:
+            self.console.print(f"[red]Error reading movie folder {movie_folder}: {e}[/red]")
+            return results
+        
+        # Locate every movie's file first; the probing below only needs the paths
+        mkv_paths = {}
         for movie_name in movie_names:
-            # Try different possible filename patterns
-            possible_paths = [
-                os.path.join(movie_folder, f"{movie_name}.mkv"),
-                os.path.join(movie_folder, f"{movie_name}.MKV"),
-                # Common variations
-                os.path.join(movie_folder, f"{movie_name.replace(':', '')}.mkv"),
-                os.path.join(movie_folder, f"{movie_name.replace(':', '')}.MKV"),
-                os.path.join(movie_folder, f"{movie_name.replace(':', ' -')}.mkv"),
-                os.path.join(movie_folder, f"{movie_name.replace(':', ' -')}.MKV"),
-                os.path.join(movie_folder, f"{movie_name.replace('&', 'and')}.mkv"),
-                os.path.join(movie_folder, f"{movie_name.replace('&', 'and')}.MKV"),
-            ]
-            
-            mkv_path = None
-            for path in possible_paths:
-                if os.path.exists(path):
-                    mkv_path = path
-                    break
-            
-            if mkv_path:
-                audio_tracks = self.get_audio_languages(mkv_path)
-                results[movie_name] = audio_tracks
-            else:
-                results[movie_name] = []
+            mkv_paths[movie_name] = exact_files.get(movie_name) or normalized_files.get(_normalize_movie_name(movie_name))
+        
+        # Run ffprobe for the found files concurrently; the threads just wait on subprocesses
+        found = [(movie_name, path) for movie_name, path in mkv_paths.items() if path]
+        probed = {}
+        if found:
+            with ThreadPoolExecutor(max_workers=min(MAX_PROBE_WORKERS, len(found))) as executor:
+                tracks = executor.map(self.get_audio_languages, [path for _, path in found])
+                probed = dict(zip([movie_name for movie_name, _ in found], tracks))
+        
+        # Keep results in the order the movies were requested
+        for movie_name in mkv_paths:
+            results[movie_name] = probed.get(movie_name, [])
         
         return results
     
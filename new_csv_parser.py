@@ -1,6 +1,12 @@
-import pandas as pd
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Tuple
 import csv
+import functools
+import os
+from operator import itemgetter
+
+# Columns every scene row must fill in, and the ones copied over only when non-blank
+REQUIRED_COLUMNS = ['movie_show', 'start_timecode', 'end_timecode', 'timeline_placement']
+OPTIONAL_COLUMNS = ['season_episode', 'episode_title', 'comment', 'language', 'audio_title', 'reality_designation']
 
 def extract_scenes(csv_path: str) -> List[Dict[str, Optional[str]]]:
     """
@@ -29,44 +35,89 @@ def extract_scenes(csv_path: str) -> List[Dict[str, Optional[str]]]:
       - language (optional)
       - audio_title (optional)
       - reality_designation (optional)
+    
+    Parsed files are cached per process on their path, mtime and size, so
+    reading an unchanged CSV again doesn't re-parse it.
+    """
+    try:
+        st = os.stat(csv_path)
+    except OSError as e:
+        raise ValueError(f"Error parsing CSV file '{csv_path}': {str(e)}")
+    scenes = _cached_scenes(os.path.abspath(csv_path), st.st_mtime_ns, st.st_size)
+    # Copies, so callers can't modify the cached scenes
+    return [dict(scene) for scene in scenes]
+
+@functools.lru_cache(maxsize=16)
+def _cached_scenes(csv_path: str, mtime_ns: int, size: int) -> Tuple[Dict[str, Optional[str]], ...]:
+    """mtime_ns and size only key the cache; parse errors raise and are never cached."""
+    return tuple(_parse_scenes(csv_path))
+
+def _parse_scenes(csv_path: str) -> List[Dict[str, Optional[str]]]:
+    try:
+        f = open(csv_path, newline='', encoding='utf-8-sig')
+    except OSError as e:
+        raise ValueError(f"Error parsing CSV file '{csv_path}': {str(e)}")
+    with f:
+        return extract_scenes_from_reader(csv.reader(f, quoting=csv.QUOTE_MINIMAL), csv_path)
+
+def extract_scenes_from_reader(reader: Iterable[List[str]], csv_path: str = '<reader>') -> List[Dict[str, Optional[str]]]:
+    """
+    Same as extract_scenes, but reads rows from an already-open csv.reader (or any
+    iterable of row lists) whose first row is the header. csv_path is only used in
+    error messages.
     """
     scenes = []
     
     try:
-        # Read CSV with headers, handling quoted fields properly
-        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False, quoting=csv.QUOTE_MINIMAL)
+        rows = iter(reader)
+        header = next(rows, None)
+        if header is None:
+            raise ValueError("No columns to parse from file")
         
         # Validate required columns exist
-        required_columns = ['movie_show', 'start_timecode', 'end_timecode', 'timeline_placement']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in header]
         
         if missing_columns:
             raise ValueError(f"Missing required columns: {missing_columns}")
         
-        # Process each row
-        for idx, row in df.iterrows():
+        # Resolve column positions once; cells are then read by index
+        required_cells = itemgetter(*(header.index(col) for col in REQUIRED_COLUMNS))
+        optional = tuple((col, header.index(col)) for col in OPTIONAL_COLUMNS if col in header)
+        width = len(header)
+        strip = str.strip
+        
+        row_number = 0
+        for row in rows:
+            # Blank lines are not data rows
+            if not row:
+                continue
+            row_number += 1
+            if len(row) < width:
+                row += [''] * (width - len(row))
+            
+            movie_show, start_timecode, end_timecode, timeline_placement = map(strip, required_cells(row))
+            
             # Skip empty rows
-            if not row['movie_show'].strip():
+            if not movie_show:
                 continue
-                
+            
             # Validate required fields
-            if not row['start_timecode'].strip() or not row['end_timecode'].strip() or not row['timeline_placement'].strip():
-                print(f"Warning: Skipping row {idx + 1} - missing required fields")
+            if not start_timecode or not end_timecode or not timeline_placement:
+                print(f"Warning: Skipping row {row_number} - missing required fields")
                 continue
             
-            # Build scene dict
             scene = {
-                'movie_show': row['movie_show'].strip(),
-                'start_timecode': row['start_timecode'].strip(),
-                'end_timecode': row['end_timecode'].strip(),
-                'timeline_placement': row['timeline_placement'].strip(),
+                'movie_show': movie_show,
+                'start_timecode': start_timecode,
+                'end_timecode': end_timecode,
+                'timeline_placement': timeline_placement,
             }
             
             # Add optional fields if they exist and have values
-            optional_fields = ['season_episode', 'episode_title', 'comment', 'language', 'audio_title', 'reality_designation']
-            for field in optional_fields:
-                if field in df.columns and row[field].strip():
-                    scene[field] = row[field].strip()
+            for col, i in optional:
+                value = row[i].strip()
+                if value:
+                    scene[col] = value
             
             scenes.append(scene)
             
@@ -1,50 +1,176 @@
+import os
+import sys
+import threading
 import time
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
-from dataclasses import dataclass, field
-from enum import Enum
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from collections import deque, namedtuple
+from datetime import datetime
+from enum import IntEnum
 
-class ErrorType(Enum):
+# Status values shared by scenes and chunks
+STATUSES = ("pending", "processing", "completed", "failed")
+
+# Number of most recent scene times the average (and so the ETA) is based on
+SCENE_TIME_WINDOW = 50
+
+# Immutable view of the state the live progress display needs; seq grows with
+# every snapshot, so a listener can tell an older one from a newer one
+ProgressSnapshot = namedtuple('ProgressSnapshot', [
+    'seq', 'chunk_number', 'completed_scenes', 'total_scenes',
+    'scene_index', 'movie_show', 'avg_time', 'chunk_start_time'
+])
+
+def _intern(value):
+    """sys.intern() strings; other values (e.g. numeric timecodes) pass through."""
+    return sys.intern(value) if type(value) is str else value
+
+@lru_cache(maxsize=8192)
+def _parse_timecode(tc):
+    """Parse a timecode string to seconds (reused from video_editor.py)."""
+    if isinstance(tc, (int, float)):
+        return float(tc)
+    # Fast path for the canonical H:M:S form
+    h, sep1, rest = str(tc).partition(":")
+    m, sep2, s = rest.partition(":")
+    if sep1 and sep2:
+        try:
+            return int(h)*3600 + int(m)*60 + float(s)
+        except ValueError:
+            pass
+    parts = str(tc).split(":")
+    parts = [float(p) for p in parts]
+    if len(parts) == 3:
+        return parts[0]*3600 + parts[1]*60 + parts[2]
+    elif len(parts) == 2:
+        return parts[0]*60 + parts[1]
+    elif len(parts) == 1:
+        return parts[0]
+    else:
+        raise ValueError(f"Invalid timecode: {tc}")
+
+@lru_cache(maxsize=128)
+def _format_whole_seconds(total_seconds: int) -> str:
+    """Format whole seconds as "Ns", "Nm Ns" or "Nh Nm" (cached between polls)."""
+    minutes, seconds = divmod(total_seconds, 60)
+    if minutes == 0:
+        return f"{seconds}s"
+    hours, minutes = divmod(minutes, 60)
+    if hours == 0:
+        return f"{minutes}m {seconds}s"
+    return f"{hours}h {minutes}m"
+
+class ErrorType(IntEnum):
     """Categories of errors that can occur during processing."""
-    CODEC_ERROR = "codec_error"
-    FILE_NOT_FOUND = "file_not_found"
-    PERMISSION_ERROR = "permission_error"
-    PROCESSING_ERROR = "processing_error"
-    UNKNOWN_ERROR = "unknown_error"
+    CODEC_ERROR = 1
+    FILE_NOT_FOUND = 2
+    PERMISSION_ERROR = 3
+    PROCESSING_ERROR = 4
+    UNKNOWN_ERROR = 5
+
+class _SlottedRecord:
+    """
+    Base for the plain record classes below. They declare __slots__ by hand
+    (dataclass(slots=True) needs Python 3.10) and get repr/equality from it.
+    """
+    __slots__ = ()
+    
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+    
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    __hash__ = None
 
-@dataclass
-class SceneInfo:
+class SceneInfo(_SlottedRecord):
     """Information about a scene being processed."""
-    movie_show: str
-    start_timecode: str
-    end_timecode: str
-    duration: float
-    chunk_number: int
-    scene_index: int
-    status: str = "pending"  # pending, processing, completed, failed
-    error_type: Optional[ErrorType] = None
-    error_message: Optional[str] = None
-    processing_time: Optional[float] = None
+    __slots__ = ('movie_show', 'start_timecode', 'end_timecode', 'duration', 'chunk_number', 'scene_index',
+                 'status', 'error_type', 'error_message', 'processing_time')
+    
+    def __init__(self, movie_show: str, start_timecode: str, end_timecode: str, duration: float,
+                 chunk_number: int, scene_index: int, status: str = "pending",
+                 error_type: Optional[ErrorType] = None, error_message: Optional[str] = None,
+                 processing_time: Optional[float] = None):
+        self.movie_show = movie_show
+        self.start_timecode = start_timecode
+        self.end_timecode = end_timecode
+        self.duration = duration
+        self.chunk_number = chunk_number
+        self.scene_index = scene_index
+        self.status = status  # pending, processing, completed, failed
+        self.error_type = error_type
+        self.error_message = error_message
+        self.processing_time = processing_time
+    
+    @property
+    def as_dict(self) -> Dict:
+        """Summary of the scene as a plain dict (for serialization)."""
+        return {
+            'movie_show': self.movie_show,
+            'chunk_number': self.chunk_number,
+            'scene_index': self.scene_index,
+            'duration': self.duration,
+            'status': self.status
+        }
 
-@dataclass
-class ChunkInfo:
+class ChunkInfo(_SlottedRecord):
     """Information about a chunk being processed."""
-    chunk_number: int
-    total_scenes: int
-    completed_scenes: int = 0
-    failed_scenes: int = 0
-    estimated_duration: float = 0.0
-    actual_duration: float = 0.0
-    start_time: Optional[datetime] = None
-    end_time: Optional[datetime] = None
-    status: str = "pending"  # pending, processing, completed, failed
-    output_file: Optional[str] = None
-    file_size: str = ""
-    error_message: Optional[str] = None
-    failed_scene_names: List[str] = field(default_factory=list)
-    output_file: Optional[str] = None
-    file_size: Optional[str] = None
-    failed_scene_names: List[str] = field(default_factory=list)
+    __slots__ = ('chunk_number', 'total_scenes', 'completed_scenes', 'failed_scenes', 'estimated_duration',
+                 'actual_duration', 'start_time', 'end_time', 'started_at', 'finished_at', 'status', 'output_file', 'file_size',
+                 'output_file_size', 'error_message', 'failed_scene_indices')
+    
+    def __init__(self, chunk_number: int, total_scenes: int, completed_scenes: int = 0, failed_scenes: int = 0,
+                 estimated_duration: float = 0.0, actual_duration: float = 0.0,
+                 start_time: Optional[float] = None, end_time: Optional[float] = None,
+                 started_at: Optional[datetime] = None, finished_at: Optional[datetime] = None,
+                 status: str = "pending", output_file: Optional[str] = None, file_size: str = "",
+                 output_file_size: Optional[int] = None, error_message: Optional[str] = None,
+                 failed_scene_indices: Optional[List[int]] = None):
+        self.chunk_number = chunk_number
+        self.total_scenes = total_scenes
+        self.completed_scenes = completed_scenes
+        self.failed_scenes = failed_scenes
+        self.estimated_duration = estimated_duration
+        self.actual_duration = actual_duration
+        self.start_time = start_time  # time.monotonic(), for durations only
+        self.end_time = end_time
+        self.started_at = started_at  # wall clock, for display/serialization
+        self.finished_at = finished_at
+        self.status = status  # pending, processing, completed, failed
+        self.output_file = output_file
+        self.file_size = file_size
+        self.output_file_size = output_file_size  # bytes, stat'ed once at completion
+        self.error_message = error_message
+        self.failed_scene_indices = [] if failed_scene_indices is None else failed_scene_indices
+    
+    @property
+    def progress_percent(self) -> float:
+        """Percentage of the chunk's scenes completed."""
+        return (self.completed_scenes / self.total_scenes * 100) if self.total_scenes > 0 else 0
+    
+    @property
+    def as_dict(self) -> Dict:
+        """Progress of the chunk as a plain dict (for serialization)."""
+        return {
+            'chunk_number': self.chunk_number,
+            'status': self.status,
+            'total_scenes': self.total_scenes,
+            'completed_scenes': self.completed_scenes,
+            'failed_scenes': self.failed_scenes,
+            'progress_percent': self.progress_percent,
+            'estimated_duration': self.estimated_duration,
+            'actual_duration': self.actual_duration,
+            'start_time': self.started_at,
+            'end_time': self.finished_at,
+            'output_file': self.output_file,
+            'file_size': self.file_size,
+            'failed_scene_indices': self.failed_scene_indices
+        }
 
 class ProgressTracker:
     """
@@ -57,10 +183,52 @@ class ProgressTracker:
         self.chunks: Dict[int, ChunkInfo] = {}
         self.current_chunk: Optional[int] = None
         self.current_scene: Optional[int] = None
-        self.processing_start_time: Optional[datetime] = None
-        self.scene_processing_times: List[float] = []
+        self.processing_start_time: Optional[float] = None
+        self.scene_processing_times: Deque[float] = deque(maxlen=SCENE_TIME_WINDOW)
         self.total_scenes_processed: int = 0
+        self._sum_processing_time: float = 0.0  # running sum of scene_processing_times
+        # Running per-status counts, kept in step with every status change so
+        # progress queries never have to scan self.scenes / self.chunks
+        self._total_scenes: int = 0
+        self._scene_status_counts: Dict[str, int] = dict.fromkeys(STATUSES, 0)
+        self._chunk_status_counts: Dict[str, int] = dict.fromkeys(STATUSES, 0)
+        self.total_estimated_duration: float = 0.0  # sum of chunk estimates, fixed by initialize_plan
+        # Called after scene state changes (e.g. to redraw the progress bar)
+        self._listeners: List[Callable[[], None]] = []
+        # Replaced wholesale on every change so readers on other threads can
+        # use it without locking
+        self.snapshot: Optional[ProgressSnapshot] = None
+        self._snapshot_seq: int = 0
+        # Scenes are started/completed from worker threads; guards every status
+        # change, the running counts and the processing-time window
+        self._lock = threading.RLock()
         
+    def add_listener(self, callback: Callable[[], None]):
+        """Register a callback to run whenever a scene starts, completes or fails."""
+        self._listeners.append(callback)
+    
+    def _notify_listeners(self):
+        """Publish a fresh snapshot and run the registered change callbacks."""
+        with self._lock:
+            chunk = self.chunks.get(self.current_chunk)
+            scene = None
+            if self.current_scene is not None and self.current_scene < len(self.scenes):
+                scene = self.scenes[self.current_scene]
+            self._snapshot_seq += 1
+            self.snapshot = ProgressSnapshot(
+                seq=self._snapshot_seq,
+                chunk_number=self.current_chunk,
+                completed_scenes=chunk.completed_scenes if chunk else 0,
+                total_scenes=chunk.total_scenes if chunk else 0,
+                scene_index=scene.scene_index if scene else None,
+                movie_show=scene.movie_show if scene else "",
+                avg_time=self.get_average_scene_time(),
+                chunk_start_time=chunk.start_time if chunk else None
+            )
+        # Outside the lock, so a slow listener never holds up the workers
+        for callback in self._listeners:
+            callback()
+    
     def initialize_plan(self, scenes_data: List[Dict], chunk_scenes_map: Dict[int, List[Dict]]):
         """
         Initialize the processing plan with scene and chunk information.
@@ -71,23 +239,26 @@ class ProgressTracker:
         """
         self.scenes.clear()
         self.chunks.clear()
+        self._scene_status_counts = dict.fromkeys(STATUSES, 0)
+        self._chunk_status_counts = dict.fromkeys(STATUSES, 0)
         
         # Create scene info objects
+        total_estimated_duration = 0.0
+        scene_fields = itemgetter('movie_show', 'start_timecode', 'end_timecode')
         scene_index = 0
         for chunk_num, chunk_scenes in chunk_scenes_map.items():
-            chunk_duration = 0.0
+            # Calculate all scene durations for the chunk in one pass
+            rows = list(map(scene_fields, chunk_scenes))
+            durations = [_parse_timecode(end_tc) - _parse_timecode(start_tc) for _, start_tc, end_tc in rows]
+            chunk_duration = sum(durations, 0.0)
             
-            for scene_data in chunk_scenes:
-                # Calculate scene duration
-                start = self._parse_timecode(scene_data['start_timecode'])
-                end = self._parse_timecode(scene_data['end_timecode'])
-                duration = end - start
-                chunk_duration += duration
-                
+            for (movie_show, start_tc, end_tc), duration in zip(rows, durations):
+                # Movie names and timecodes repeat heavily; intern them so
+                # duplicates share one string object
                 scene_info = SceneInfo(
-                    movie_show=scene_data['movie_show'],
-                    start_timecode=scene_data['start_timecode'],
-                    end_timecode=scene_data['end_timecode'],
+                    movie_show=_intern(movie_show),
+                    start_timecode=_intern(start_tc),
+                    end_timecode=_intern(end_tc),
                     duration=duration,
                     chunk_number=chunk_num,
                     scene_index=scene_index
@@ -102,86 +273,136 @@ class ProgressTracker:
                 estimated_duration=chunk_duration
             )
             self.chunks[chunk_num] = chunk_info
+            total_estimated_duration += chunk_duration
+        
+        self.total_estimated_duration = total_estimated_duration
+        self._total_scenes = len(self.scenes)
+        self._scene_status_counts["pending"] = self._total_scenes
+        self._chunk_status_counts["pending"] = len(self.chunks)
+    
+    def _set_scene_status(self, scene: SceneInfo, status: str):
+        """Change a scene's status and update the running counts."""
+        counts = self._scene_status_counts
+        counts[scene.status] -= 1
+        counts[status] += 1
+        scene.status = status
+    
+    def _set_chunk_status(self, chunk: ChunkInfo, status: str):
+        """Change a chunk's status and update the running counts."""
+        counts = self._chunk_status_counts
+        counts[chunk.status] -= 1
+        counts[status] += 1
+        chunk.status = status
     
     def start_processing(self):
         """Mark the start of overall processing."""
-        self.processing_start_time = datetime.now()
+        self.processing_start_time = time.monotonic()
     
     def start_chunk(self, chunk_number: int):
         """Mark the start of processing a specific chunk."""
-        self.current_chunk = chunk_number
-        if chunk_number in self.chunks:
-            self.chunks[chunk_number].status = "processing"
-            self.chunks[chunk_number].start_time = datetime.now()
+        with self._lock:
+            self.current_chunk = chunk_number
+            chunk = self.chunks.get(chunk_number)
+            if chunk is None:
+                return
+            self._set_chunk_status(chunk, "processing")
+            chunk.start_time = time.monotonic()
+            chunk.started_at = datetime.now()
+        self._notify_listeners()
     
     def start_scene(self, scene_index: int):
         """Mark the start of processing a specific scene."""
-        self.current_scene = scene_index
-        if scene_index < len(self.scenes):
-            self.scenes[scene_index].status = "processing"
+        with self._lock:
+            self.current_scene = scene_index
+            if scene_index >= len(self.scenes):
+                return
+            self._set_scene_status(self.scenes[scene_index], "processing")
+        self._notify_listeners()
     
     def complete_scene(self, scene_index: int, processing_time: float):
         """Mark a scene as completed successfully."""
-        if scene_index < len(self.scenes):
+        with self._lock:
+            if scene_index >= len(self.scenes):
+                return
             scene = self.scenes[scene_index]
-            scene.status = "completed"
+            self._set_scene_status(scene, "completed")
             scene.processing_time = processing_time
             
             # Update chunk progress
-            chunk_num = scene.chunk_number
-            if chunk_num in self.chunks:
-                self.chunks[chunk_num].completed_scenes += 1
+            chunk = self.chunks.get(scene.chunk_number)
+            if chunk is not None:
+                chunk.completed_scenes += 1
             
             # Track processing times for ETA calculation
-            self.scene_processing_times.append(processing_time)
+            times = self.scene_processing_times
+            if len(times) == times.maxlen:
+                self._sum_processing_time -= times[0]
+            times.append(processing_time)
+            self._sum_processing_time += processing_time
             self.total_scenes_processed += 1
+        self._notify_listeners()
     
     def fail_scene(self, scene_index: int, error_type: ErrorType, error_message: str):
         """Mark a scene as failed with error details."""
-        if scene_index < len(self.scenes):
+        with self._lock:
+            if scene_index >= len(self.scenes):
+                return
             scene = self.scenes[scene_index]
-            scene.status = "failed"
+            self._set_scene_status(scene, "failed")
             scene.error_type = error_type
             scene.error_message = error_message
             
             # Update chunk progress
-            chunk_num = scene.chunk_number
-            if chunk_num in self.chunks:
-                chunk = self.chunks[chunk_num]
+            chunk = self.chunks.get(scene.chunk_number)
+            if chunk is not None:
                 chunk.failed_scenes += 1
-                chunk.failed_scene_names.append(scene.movie_show)
+                chunk.failed_scene_indices.append(scene_index)
+        self._notify_listeners()
     
     def complete_chunk(self, chunk_number: int, output_file: str, file_size: str = ""):
         """Mark a chunk as completed."""
-        if chunk_number in self.chunks:
-            chunk = self.chunks[chunk_number]
-            chunk.status = "completed"
-            chunk.end_time = datetime.now()
+        chunk = self.chunks.get(chunk_number)
+        if chunk is None:
+            return
+        try:
+            output_file_size = os.path.getsize(output_file)
+        except OSError:
+            output_file_size = None
+        with self._lock:
+            self._set_chunk_status(chunk, "completed")
+            chunk.end_time = time.monotonic()
+            chunk.finished_at = datetime.now()
             chunk.output_file = output_file
             chunk.file_size = file_size
+            chunk.output_file_size = output_file_size
             
-            if chunk.start_time:
-                chunk.actual_duration = (chunk.end_time - chunk.start_time).total_seconds()
+            if chunk.start_time is not None:
+                chunk.actual_duration = chunk.end_time - chunk.start_time
     
     def fail_chunk(self, chunk_number: int, error_message: str):
         """Mark a chunk as failed."""
-        if chunk_number in self.chunks:
-            chunk = self.chunks[chunk_number]
-            chunk.status = "failed"
-            chunk.end_time = datetime.now()
+        chunk = self.chunks.get(chunk_number)
+        if chunk is None:
+            return
+        with self._lock:
+            self._set_chunk_status(chunk, "failed")
+            chunk.end_time = time.monotonic()
+            chunk.finished_at = datetime.now()
             chunk.error_message = error_message
             
-            if chunk.start_time:
-                chunk.actual_duration = (chunk.end_time - chunk.start_time).total_seconds()
+            if chunk.start_time is not None:
+                chunk.actual_duration = chunk.end_time - chunk.start_time
     
     def get_overall_progress(self) -> Dict:
         """Get overall processing progress statistics."""
-        total_scenes = len(self.scenes)
-        completed_scenes = sum(1 for s in self.scenes if s.status == "completed")
-        failed_scenes = sum(1 for s in self.scenes if s.status == "failed")
-        
-        total_chunks = len(self.chunks)
-        completed_chunks = sum(1 for c in self.chunks.values() if c.status == "completed")
+        # Read the counts together so they describe one moment
+        with self._lock:
+            total_scenes = self._total_scenes
+            completed_scenes = self._scene_status_counts["completed"]
+            failed_scenes = self._scene_status_counts["failed"]
+            
+            total_chunks = len(self.chunks)
+            completed_chunks = self._chunk_status_counts["completed"]
         
         return {
             'total_scenes': total_scenes,
@@ -192,109 +413,60 @@ class ProgressTracker:
             'progress_percent': (completed_scenes / total_scenes * 100) if total_scenes > 0 else 0
         }
     
-    def get_chunk_progress(self, chunk_number: int) -> Dict:
+    def get_chunk_progress(self, chunk_number: int) -> Optional[ChunkInfo]:
         """Get progress information for a specific chunk."""
-        if chunk_number not in self.chunks:
-            return {}
-        
-        chunk = self.chunks[chunk_number]
-        progress_percent = (chunk.completed_scenes / chunk.total_scenes * 100) if chunk.total_scenes > 0 else 0
-        
-        return {
-            'chunk_number': chunk_number,
-            'status': chunk.status,
-            'total_scenes': chunk.total_scenes,
-            'completed_scenes': chunk.completed_scenes,
-            'failed_scenes': chunk.failed_scenes,
-            'progress_percent': progress_percent,
-            'estimated_duration': chunk.estimated_duration,
-            'actual_duration': chunk.actual_duration,
-            'start_time': chunk.start_time,
-            'output_file': chunk.output_file,
-            'file_size': chunk.file_size,
-            'failed_scene_names': chunk.failed_scene_names
-        }
+        return self.chunks.get(chunk_number)
     
-    def get_current_scene_info(self) -> Optional[Dict]:
+    def get_failed_scene_names(self, chunk_number: int) -> List[str]:
+        """Get the names of the scenes that failed in a specific chunk."""
+        chunk = self.chunks.get(chunk_number)
+        if chunk is None:
+            return []
+        scenes = self.scenes
+        return [scenes[i].movie_show for i in chunk.failed_scene_indices]
+    
+    def get_current_scene_info(self) -> Optional[SceneInfo]:
         """Get information about the currently processing scene."""
         if self.current_scene is None or self.current_scene >= len(self.scenes):
             return None
         
-        scene = self.scenes[self.current_scene]
-        return {
-            'movie_show': scene.movie_show,
-            'chunk_number': scene.chunk_number,
-            'scene_index': scene.scene_index,
-            'duration': scene.duration,
-            'status': scene.status
-        }
+        return self.scenes[self.current_scene]
     
     def get_eta_estimate(self) -> Optional[str]:
         """Calculate estimated time remaining based on average processing times."""
-        if not self.scene_processing_times:
-            return None
-        
-        # Calculate average processing time per scene
-        avg_time = sum(self.scene_processing_times) / len(self.scene_processing_times)
-        
-        # Count remaining scenes
-        remaining_scenes = sum(1 for s in self.scenes if s.status == "pending")
+        with self._lock:
+            if not self.scene_processing_times:
+                return None
+            
+            # Calculate average processing time per scene
+            avg_time = self._sum_processing_time / len(self.scene_processing_times)
+            
+            # Count remaining scenes
+            remaining_scenes = self._scene_status_counts["pending"]
         
         if remaining_scenes == 0:
             return "Complete"
         
         # Calculate ETA
         estimated_seconds = remaining_scenes * avg_time
-        eta_delta = timedelta(seconds=estimated_seconds)
         
-        # Format as human readable
-        if estimated_seconds < 60:
-            return f"{int(estimated_seconds)}s"
-        elif estimated_seconds < 3600:
-            minutes = int(estimated_seconds // 60)
-            seconds = int(estimated_seconds % 60)
-            return f"{minutes}m {seconds}s"
-        else:
-            hours = int(estimated_seconds // 3600)
-            minutes = int((estimated_seconds % 3600) // 60)
-            return f"{hours}h {minutes}m"
+        return self._format_duration(estimated_seconds)
     
     def get_average_scene_time(self) -> Optional[float]:
         """Get average processing time per scene."""
-        if not self.scene_processing_times:
-            return None
-        return sum(self.scene_processing_times) / len(self.scene_processing_times)
+        with self._lock:
+            if not self.scene_processing_times:
+                return None
+            return self._sum_processing_time / len(self.scene_processing_times)
     
     def get_processing_duration(self) -> Optional[str]:
         """Get total processing duration so far."""
-        if not self.processing_start_time:
+        if self.processing_start_time is None:
             return None
         
-        duration = datetime.now() - self.processing_start_time
-        total_seconds = duration.total_seconds()
-        
-        if total_seconds < 60:
-            return f"{int(total_seconds)}s"
-        elif total_seconds < 3600:
-            minutes = int(total_seconds // 60)
-            seconds = int(total_seconds % 60)
-            return f"{minutes}m {seconds}s"
-        else:
-            hours = int(total_seconds // 3600)
-            minutes = int((total_seconds % 3600) // 60)
-            return f"{hours}h {minutes}m"
+        return self._format_duration(time.monotonic() - self.processing_start_time)
     
-    def _parse_timecode(self, tc):
-        """Parse a timecode string to seconds (reused from video_editor.py)."""
-        if isinstance(tc, (int, float)):
-            return float(tc)
-        parts = str(tc).split(":")
-        parts = [float(p) for p in parts]
-        if len(parts) == 3:
-            return parts[0]*3600 + parts[1]*60 + parts[2]
-        elif len(parts) == 2:
-            return parts[0]*60 + parts[1]
-        elif len(parts) == 1:
-            return parts[0]
-        else:
-            raise ValueError(f"Invalid timecode: {tc}") 
\ No newline at end of file
+    @staticmethod
+    def _format_duration(total_seconds: float) -> str:
+        """Format a duration in seconds as a human readable string."""
+        return _format_whole_seconds(int(total_seconds)) 
\ No newline at end of file
@@ -1,18 +1,29 @@
 import os
+import shutil
 import sys
-import time
 import threading
+import time
+from collections import defaultdict
 from typing import Dict, List, Optional
-from datetime import datetime
-from progress_tracker import ProgressTracker
+from progress_tracker import ProgressTracker, ErrorType
 from logger import ProgressLogger
 
 # Rich library for static displays only
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
 from tqdm import tqdm
 
+# Display names for error types, e.g. ErrorType.CODEC_ERROR -> "Codec Error"
+ERROR_TYPE_LABELS = {error_type: error_type.name.replace('_', ' ').title() for error_type in ErrorType}
+
+# Units above bytes and the decimals shown for each
+SIZE_UNITS = (("KB", 1), ("MB", 2), ("GB", 2))
+
+# Seconds between forced redraws while no scene changes, so the elapsed times
+# keep moving during a long scene or render (tqdm has no refresh thread of its own)
+TICK_INTERVAL = 1.0
+
 class ProgressUI:
     """
     UI display system for Marvel Mega Cut processing.
@@ -30,105 +41,114 @@ class ProgressUI:
         self.progress_started = False
         self.current_pbar = None
         self.current_chunk = None
+        # Last values drawn to the progress bar, to skip redundant redraws
+        self._last_completed = -1
+        self._last_desc = None
+        self._last_postfix = None
+        # Description/postfix strings and the inputs they were built from
+        self._last_snapshot = None
+        self._desc = ""
+        self._postfix_elapsed = None
+        self._postfix = ""
+        # Tracker listeners run on whichever worker thread changed a scene;
+        # only one of them may touch the bar at a time
+        self._redraw_lock = threading.Lock()
+        self._last_drawn_seq = 0
+        self._ticker = None
+        self._ticker_stop = threading.Event()
         
-        # Threading for UI updates
-        self.ui_thread = None
-        self.ui_running = False
-        self.ui_lock = threading.Lock()
+        # Redraw synchronously whenever the tracker reports a change
+        self.tracker.add_listener(self._on_tracker_update)
     
-    def start_ui_thread(self):
-        """Start the UI update thread."""
-        if self.ui_thread is None or not self.ui_thread.is_alive():
-            self.ui_running = True
-            self.ui_thread = threading.Thread(target=self._ui_update_loop, daemon=True)
-            self.ui_thread.start()
-            if self.debug:
-                self.logger.log_info("Started UI update thread")
-    
-    def stop_ui_thread(self):
-        """Stop the UI update thread."""
-        self.ui_running = False
-        if self.ui_thread and self.ui_thread.is_alive():
-            self.ui_thread.join(timeout=2)
-            if self.debug:
-                self.logger.log_info("Stopped UI update thread")
-    
-    def _ui_update_loop(self):
-        """Main loop for UI updates in separate thread."""
-        while self.ui_running:
+    def _on_tracker_update(self):
+        """Redraw the progress bar after a tracker state change (runs on the caller's thread)."""
+        with self._redraw_lock:
+            if not (self.current_chunk and self.progress_started and self.current_pbar):
+                return
             try:
-                with self.ui_lock:
-                    if self.current_chunk and self.progress_started and self.current_pbar:
-                        self._update_progress_display()
-                time.sleep(0.1)  # Update every 100ms for smooth animation
+                self._update_progress_display()
             except Exception as e:
                 if self.debug:
-                    self.logger.log_error(f"UI thread error: {e}")
+                    self.logger.log_error(f"Progress display error: {e}")
+    
+    def _tick(self):
+        """Redraw the bar about once a second until the display stops."""
+        while not self._ticker_stop.wait(TICK_INTERVAL):
+            with self._redraw_lock:
+                if not (self.current_chunk and self.progress_started and self.current_pbar):
+                    continue
+                try:
+                    self._update_progress_display(force=True)
+                except Exception as e:
+                    if self.debug:
+                        self.logger.log_error(f"Progress display error: {e}")
     
-    def _update_progress_display(self):
-        """Update the progress display (called from UI thread)."""
-        chunk_info = self.tracker.get_chunk_progress(self.current_chunk)
-        if not chunk_info or not self.current_pbar:
+    def _update_progress_display(self, force: bool = False):
+        """Update the progress display from the tracker's latest snapshot (call with _redraw_lock held)."""
+        snap = self.tracker.snapshot
+        if snap is None or not self.current_pbar:
             return
+        # Never step back to an older state than one already drawn
+        if snap.seq < self._last_drawn_seq:
+            return
+        self._last_drawn_seq = snap.seq
         
-        # Update the progress bar
-        self.current_pbar.n = chunk_info['completed_scenes']
-        self.current_pbar.total = chunk_info['total_scenes']
-        
-        # Update the description with current scene info
-        current_scene = self.tracker.get_current_scene_info()
-        scene_name = ""
-        if current_scene:
-            scene_name = current_scene['movie_show'][:20] + "..." if len(current_scene['movie_show']) > 20 else current_scene['movie_show']
+        completed = snap.completed_scenes
         
-        avg_time = self.tracker.get_average_scene_time()
-        avg_text = f" | Avg: {avg_time:.1f}s" if avg_time else ""
+        # Update the description with current scene info; only rebuilt when
+        # the tracker publishes a new snapshot
+        if snap is not self._last_snapshot:
+            movie_show = snap.movie_show
+            scene_name = movie_show[:20] + "..." if len(movie_show) > 20 else movie_show
+            avg_text = f" | Avg: {snap.avg_time:.1f}s" if snap.avg_time else ""
+            # Note: tqdm handles colors automatically in the bar, description uses ANSI colors
+            self._desc = f"🎯 {scene_name}{avg_text}"
+            self._last_snapshot = snap
+        desc = self._desc
         
         # Update the postfix with elapsed time
-        chunk = self.tracker.chunks.get(self.current_chunk)
         elapsed = ""
-        if chunk and chunk.start_time:
-            elapsed_seconds = (datetime.now() - chunk.start_time).total_seconds()
+        if snap.chunk_start_time is not None:
+            elapsed_seconds = time.monotonic() - snap.chunk_start_time
             elapsed = self._format_duration(elapsed_seconds)
+        if elapsed != self._postfix_elapsed:
+            self._postfix = f"Elapsed: {elapsed}"
+            self._postfix_elapsed = elapsed
+        postfix = self._postfix
         
-        # Update the progress bar description and postfix
-        # Note: tqdm handles colors automatically in the bar, description uses ANSI colors
-        desc = f"🎯 {scene_name}{avg_text}"
-        postfix = f"Elapsed: {elapsed}"
+        # Skip the redraw if nothing visible changed (the ticker forces one so
+        # the bar's own elapsed/rate fields stay current)
+        if not force and completed == self._last_completed and desc == self._last_desc and postfix == self._last_postfix:
+            return
         
-        self.current_pbar.set_description(desc)
-        self.current_pbar.set_postfix_str(postfix)
+        # Update the progress bar
+        self.current_pbar.n = completed
+        self.current_pbar.total = snap.total_scenes
+        self.current_pbar.set_description(desc, refresh=False)
+        self.current_pbar.set_postfix_str(postfix, refresh=False)
         
         # Refresh the display
         self.current_pbar.refresh()
+        self._last_completed = completed
+        self._last_desc = desc
+        self._last_postfix = postfix
     
     def _format_duration(self, seconds: float) -> str:
         """Format duration in seconds to human readable format."""
-        if seconds < 60:
-            return f"{int(seconds)}s"
-        elif seconds < 3600:
-            minutes = int(seconds // 60)
-            secs = int(seconds % 60)
-            return f"{minutes}m {secs}s"
-        else:
-            hours = int(seconds // 3600)
-            minutes = int((seconds % 3600) // 60)
-            return f"{hours}h {minutes}m"
+        return ProgressTracker._format_duration(seconds)
     
-    def _format_file_size(self, file_path: str) -> str:
+    def _format_file_size(self, size_bytes: Optional[int]) -> str:
         """Format file size in human readable format."""
-        try:
-            size_bytes = os.path.getsize(file_path)
-            if size_bytes < 1024:
-                return f"{size_bytes} B"
-            elif size_bytes < 1024 * 1024:
-                return f"{size_bytes / 1024:.1f} KB"
-            elif size_bytes < 1024 * 1024 * 1024:
-                return f"{size_bytes / (1024 * 1024):.2f} MB"
-            else:
-                return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
-        except OSError:
+        if size_bytes is None:
             return "Unknown"
+        if size_bytes < 1024:
+            return f"{size_bytes} B"
+        size = size_bytes
+        for unit, decimals in SIZE_UNITS:
+            size /= 1024
+            if size < 1024 or unit == "GB":
+                break
+        return f"{size:.{decimals}f} {unit}"
     
     def display_initial_summary(self, selected_chunks: Optional[List[int]] = None):
         """Display the initial processing summary."""
@@ -144,13 +164,9 @@ class ProgressUI:
         
         # Processing summary
         progress = self.tracker.get_overall_progress()
-        total_est_duration = sum(
-            self.tracker.chunks[chunk_num].estimated_duration 
-            for chunk_num in self.tracker.chunks.keys()
-        )
+        total_est_duration = self.tracker.total_estimated_duration
         
-        hours = int(total_est_duration // 3600)
-        minutes = int((total_est_duration % 3600) // 60)
+        hours, minutes = divmod(int(total_est_duration) // 60, 60)
         duration_str = f"{hours}h {minutes}m"
         
         chunks_display = f" | Selected: {selected_chunks}" if selected_chunks else ""
@@ -172,15 +188,21 @@ class ProgressUI:
         """Start the progress display."""
         if not self.progress_started:
             self.progress_started = True
-            self.start_ui_thread()
             print()  # Add a newline before progress starts
+            self._ticker_stop.clear()
+            self._ticker = threading.Thread(target=self._tick, name='mega_cut-progress-ticker', daemon=True)
+            self._ticker.start()
     
     def stop_progress_display(self):
         """Stop the progress display."""
         if self.progress_started:
-            self.stop_ui_thread()
-            if self.current_pbar:
-                self.current_pbar.close()
+            self._ticker_stop.set()
+            if self._ticker is not None:
+                self._ticker.join()
+                self._ticker = None
+            with self._redraw_lock:
+                if self.current_pbar:
+                    self.current_pbar.close()
             print()  # Add a newline after final progress
             self.progress_started = False
     
@@ -189,26 +211,36 @@ class ProgressUI:
         if not self.progress_started:
             self.start_progress_display()
         
-        # Set the current chunk for the UI thread
-        with self.ui_lock:
-            self.current_chunk = chunk_number
+        # Set the current chunk for the progress display
+        self.current_chunk = chunk_number
+        
+        # Create or update the progress bar
+        chunk_info = self.tracker.get_chunk_progress(chunk_number)
+        if chunk_info and not self.current_pbar:
+            # Create new progress bar for this chunk
+            est_hours, est_minutes = divmod(int(chunk_info.estimated_duration) // 60, 60)
+            desc = f"Chunk {chunk_number}/{len(self.tracker.chunks)} ({chunk_info.total_scenes} scenes, ~{est_hours}h {est_minutes}m)"
+            # Measure the terminal once rather than letting tqdm re-query it
+            ncols = shutil.get_terminal_size((80, 24)).columns
             
-            # Create or update the progress bar
-            chunk_info = self.tracker.get_chunk_progress(chunk_number)
-            if chunk_info and not self.current_pbar:
-                # Create new progress bar for this chunk
-                est_hours = int(chunk_info['estimated_duration'] // 3600)
-                est_minutes = int((chunk_info['estimated_duration'] % 3600) // 60)
-                desc = f"Chunk {chunk_number}/{len(self.tracker.chunks)} ({chunk_info['total_scenes']} scenes, ~{est_hours}h {est_minutes}m)"
-                
-                self.current_pbar = tqdm(
-                    total=chunk_info['total_scenes'],
-                    desc=desc,
-                    unit="scenes",
-                    bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]',
-                    leave=True,
-                    colour='green'  # Add color to the progress bar
-                )
+            pbar = tqdm(
+                total=chunk_info.total_scenes,
+                desc=desc,
+                unit="scenes",
+                bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}, {rate_fmt}]',
+                leave=True,
+                colour='green',  # Add color to the progress bar
+                mininterval=0.1,
+                miniters=1,
+                ncols=ncols,
+                dynamic_ncols=False,
+                smoothing=0.1
+            )
+            with self._redraw_lock:
+                self.current_pbar = pbar
+                self._last_completed = -1
+                self._last_desc = None
+                self._last_postfix = None
     
     def update_scene_progress(self, scene_name: str, scene_num: int, total_scenes: int):
         """Update current scene processing progress."""
@@ -225,10 +257,9 @@ class ProgressUI:
         if not self.progress_started:
             return
         
-        # Print render progress on a new line
-        print()  # New line after chunk progress
-        render_line = f"🎬 Video Rendering: {message}"
-        self.console.print(render_line)
+        # Print render progress on a new line (plain text, no Rich rendering needed)
+        sys.stdout.write(f"\n🎬 Video Rendering: {message}\n")
+        sys.stdout.flush()
     
     def complete_render_progress(self):
         """Complete and hide the render progress."""
@@ -242,9 +273,6 @@ class ProgressUI:
         progress = self.tracker.get_overall_progress()
         total_duration = self.tracker.get_processing_duration()
         
-        # Print a clear completion message
-        self.console.print("\n🎉 [bold green]PROCESSING COMPLETE![/bold green]")
-        
         # Completion summary
         completion_panel = Panel(
             f"🎉 [bold green]PROCESSING COMPLETE![/bold green]\n"
@@ -255,37 +283,38 @@ class ProgressUI:
             border_style="green",
             title="Summary"
         )
-        self.console.print(completion_panel)
         
         # Output files
         output_table = Table(title="📁 OUTPUT FILES", box=None)
         output_table.add_column("File", style="cyan")
         output_table.add_column("Size", style="green")
         
-        for chunk_num, chunk in self.tracker.chunks.items():
+        for chunk in self.tracker.chunks.values():
             if chunk.output_file and chunk.status == "completed":
-                file_size = self._format_file_size(chunk.output_file)
+                file_size = self._format_file_size(chunk.output_file_size)
                 filename = os.path.basename(chunk.output_file)
                 output_table.add_row(f"• {filename}", file_size)
         
+        # Render everything in one print so it goes out as a single write
         if output_table.row_count > 0:
-            self.console.print(output_table)
+            self.console.print(Group(completion_panel, output_table))
+        else:
+            self.console.print(completion_panel)
     
     def display_error_summary(self):
         """Display error summary if there were failures."""
-        failed_scenes = [s for s in self.tracker.scenes if s.status == "failed"]
-        if not failed_scenes:
+        failed_count = self.tracker.get_overall_progress()['failed_scenes']
+        if not failed_count:
             return
         
-        # Group by error type
-        error_groups = {}
-        for scene in failed_scenes:
-            error_type = scene.error_type.value if scene.error_type else "unknown"
-            if error_type not in error_groups:
-                error_groups[error_type] = []
-            error_groups[error_type].append(scene.movie_show)
+        # Group failed scenes by error type in one pass
+        error_groups = defaultdict(list)
+        for scene in self.tracker.scenes:
+            if scene.status != "failed":
+                continue
+            error_groups[scene.error_type or ErrorType.UNKNOWN_ERROR].append(scene.movie_show)
         
-        error_table = Table(title=f"⚠️  ERROR SUMMARY ({len(failed_scenes)} failed scenes)", box=None)
+        error_table = Table(title=f"⚠️  ERROR SUMMARY ({failed_count} failed scenes)", box=None)
         error_table.add_column("Error Type", style="red")
         error_table.add_column("Count", style="yellow")
         error_table.add_column("Examples", style="dim")
@@ -296,23 +325,28 @@ class ProgressUI:
                 examples += f", +{len(scene_names) - 2} more"
             
             error_table.add_row(
-                error_type.replace('_', ' ').title(),
+                ERROR_TYPE_LABELS[error_type],
                 str(len(scene_names)),
                 examples
             )
         
-        self.console.print(error_table)
-        self.console.print(f"[dim]📄 Full error details in: {self.logger.log_file}[/dim]")
+        self.console.print(Group(
+            error_table,
+            f"[dim]📄 Full error details in: {self.logger.log_file}[/dim]"
+        ))
     
     def show_error(self, message: str):
         """Display a prominent error message."""
-        print()  # New line before error
         error_panel = Panel(
             f"❌ [bold red]ERROR[/bold red]\n{message}",
             border_style="red",
             title="Error"
         )
-        self.console.print(error_panel)
+        # Render the panel off-screen and emit it in one write
+        with self.console.capture() as capture:
+            self.console.print(error_panel)
+        sys.stdout.write("\n" + capture.get())  # New line before error
+        sys.stdout.flush()
     
     def refresh_display(self):
         """Refresh the current display."""
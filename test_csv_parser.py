@@ -3,18 +3,16 @@ from csv_parser import extract_scenes
 
 def test_extract_scenes():
     scenes = extract_scenes('sample_scenes.csv')
+    shows = {scene['movie_show'] for scene in scenes}
+    placements = {scene['timeline_placement'] for scene in scenes}
     # There should be at least one known scene from the sample
-    assert any(scene['movie_show'] == 'Iron Man' for scene in scenes)
-    assert any(scene['timeline_placement'] == '2008' for scene in scenes)
+    assert 'Iron Man' in shows
+    assert '2008' in placements
     # Check that all extracted scenes have required fields
-    for scene in scenes:
-        assert scene['movie_show']
-        assert scene['start_timecode']
-        assert scene['end_timecode']
-        assert scene['timeline_placement']
+    assert all(scene['movie_show'] and scene['start_timecode'] and scene['end_timecode'] and scene['timeline_placement']
+               for scene in scenes)
     # Check that header/section rows are not included
-    assert not any(scene['movie_show'].startswith('EVERYTHING') for scene in scenes)
-    assert not any(scene['movie_show'].startswith('LEGEND') for scene in scenes)
+    assert not any(show.startswith(('EVERYTHING', 'LEGEND')) for show in shows)
 
 def test_agents_of_shield_s3e19():
     scenes = extract_scenes('sample_scenes.csv')
@@ -1,16 +1,18 @@
 import os
 import sys
 import pytest
+from pathlib import Path
 from click.testing import CliRunner
 from main import main
 
+CSV_HEADER = 'movie,season,episode,title,start_time,end_time,timeline\n'
+
 def test_cli_args(monkeypatch):
     runner = CliRunner()
     # Set required env var for movie folder
     monkeypatch.setenv('MEGA_CUT_MOVIE_FOLDER', 'movies')
     with runner.isolated_filesystem():
-        with open('test.csv', 'w') as f:
-            f.write('movie,season,episode,title,start_time,end_time,timeline\n')
+        Path('test.csv').write_text(CSV_HEADER)
         result = runner.invoke(main, ['--csv', 'test.csv', '--output', 'outdir'])
         assert 'Loading scenes from: test.csv' in result.output
         assert 'Output folder: outdir' in result.output
@@ -20,8 +22,7 @@ def test_cli_args(monkeypatch):
 def test_env_vars(monkeypatch):
     runner = CliRunner()
     with runner.isolated_filesystem():
-        with open('env.csv', 'w') as f:
-            f.write('movie,season,episode,title,start_time,end_time,timeline\n')
+        Path('env.csv').write_text(CSV_HEADER)
         monkeypatch.setenv('MEGA_CUT_CSV', 'env.csv')
         monkeypatch.setenv('MEGA_CUT_OUTPUT', 'envout')
         monkeypatch.setenv('MEGA_CUT_MOVIE_FOLDER', 'envmovies')
@@ -47,8 +48,7 @@ def test_movies_cli_arg(monkeypatch):
     # Set a different env var to ensure CLI takes precedence
     monkeypatch.setenv('MEGA_CUT_MOVIE_FOLDER', 'env_movies')
     with runner.isolated_filesystem():
-        with open('test.csv', 'w') as f:
-            f.write('movie,season,episode,title,start_time,end_time,timeline\n')
+        Path('test.csv').write_text(CSV_HEADER)
         result = runner.invoke(main, ['--csv', 'test.csv', '--output', 'outdir', '--movies', 'cli_movies'])
         assert 'Loading scenes from: test.csv' in result.output
         assert 'Output folder: outdir' in result.output
@@ -62,8 +62,7 @@ def test_all_cli_args(monkeypatch):
     monkeypatch.delenv('MEGA_CUT_OUTPUT', raising=False)
     monkeypatch.delenv('MEGA_CUT_MOVIE_FOLDER', raising=False)
     with runner.isolated_filesystem():
-        with open('test.csv', 'w') as f:
-            f.write('movie,season,episode,title,start_time,end_time,timeline\n')
+        Path('test.csv').write_text(CSV_HEADER)
         result = runner.invoke(main, ['--csv', 'test.csv', '--output', 'outdir', '--movies', 'moviedir'])
         assert 'Loading scenes from: test.csv' in result.output
         assert 'Output folder: outdir' in result.output
@@ -77,8 +76,7 @@ def test_chunks_parameter(monkeypatch):
     monkeypatch.delenv('MEGA_CUT_OUTPUT', raising=False)
     monkeypatch.delenv('MEGA_CUT_MOVIE_FOLDER', raising=False)
     with runner.isolated_filesystem():
-        with open('test.csv', 'w') as f:
-            f.write('movie,season,episode,title,start_time,end_time,timeline\n')
+        Path('test.csv').write_text(CSV_HEADER)
         
         # Test valid chunk selection
         result = runner.invoke(main, [
@@ -97,8 +95,7 @@ def test_chunks_parameter_single(monkeypatch):
     monkeypatch.delenv('MEGA_CUT_OUTPUT', raising=False)
     monkeypatch.delenv('MEGA_CUT_MOVIE_FOLDER', raising=False)
     with runner.isolated_filesystem():
-        with open('test.csv', 'w') as f:
-            f.write('movie,season,episode,title,start_time,end_time,timeline\n')
+        Path('test.csv').write_text(CSV_HEADER)
         
         # Test single chunk
         result = runner.invoke(main, [
@@ -117,8 +114,7 @@ def test_chunks_parameter_invalid(monkeypatch):
     monkeypatch.delenv('MEGA_CUT_OUTPUT', raising=False)
     monkeypatch.delenv('MEGA_CUT_MOVIE_FOLDER', raising=False)
     with runner.isolated_filesystem():
-        with open('test.csv', 'w') as f:
-            f.write('movie,season,episode,title,start_time,end_time,timeline\n')
+        Path('test.csv').write_text(CSV_HEADER)
         
         # Test invalid chunk selection - should exit with error
         result = runner.invoke(main, [
@@ -137,8 +133,7 @@ def test_chunks_parameter_invalid_range(monkeypatch):
     monkeypatch.delenv('MEGA_CUT_OUTPUT', raising=False)
     monkeypatch.delenv('MEGA_CUT_MOVIE_FOLDER', raising=False)
     with runner.isolated_filesystem():
-        with open('test.csv', 'w') as f:
-            f.write('movie,season,episode,title,start_time,end_time,timeline\n')
+        Path('test.csv').write_text(CSV_HEADER)
         
         # Test invalid range (start > end)
         result = runner.invoke(main, [
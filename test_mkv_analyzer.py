@@ -4,7 +4,7 @@ import json
 import subprocess
 from unittest.mock import patch, MagicMock
 import pytest
-from mkv_analyzer import MKVAnalyzer
+from mkv_analyzer import MKVAnalyzer, _probe_audio_tracks
 
 class TestMKVAnalyzer:
     """Test cases for MKVAnalyzer class."""
@@ -12,6 +12,7 @@ class TestMKVAnalyzer:
     def setup_method(self):
         """Set up test fixtures."""
         self.analyzer = MKVAnalyzer()
+        _probe_audio_tracks.cache_clear()
     
     def test_format_language_display(self):
         """Test language code formatting."""
@@ -53,7 +54,7 @@ class TestMKVAnalyzer:
         }
         
         mock_result = MagicMock()
-        mock_result.stdout = json.dumps(mock_output)
+        mock_result.stdout = json.dumps(mock_output).encode()
         mock_run.return_value = mock_result
         
         # Test with a dummy path
@@ -73,6 +74,10 @@ class TestMKVAnalyzer:
         assert call_args[0] == 'ffprobe'
         assert call_args[1] == '-v'
         assert call_args[2] == 'quiet'
+        # Only audio streams, and only the fields that are read back
+        assert call_args[call_args.index('-select_streams') + 1] == 'a'
+        assert call_args[call_args.index('-show_entries') + 1] == 'stream=index,codec_name,channels:stream_tags=language,title'
+        assert call_args[-1] == "/dummy/path.mkv"
     
     @patch('mkv_analyzer.subprocess.run')
     @patch('mkv_analyzer.os.path.exists')
@@ -81,7 +86,7 @@ class TestMKVAnalyzer:
         mock_exists.return_value = True
         mock_output = {"streams": []}
         mock_result = MagicMock()
-        mock_result.stdout = json.dumps(mock_output)
+        mock_result.stdout = json.dumps(mock_output).encode()
         mock_run.return_value = mock_result
         
         result = self.analyzer.get_audio_languages("/dummy/path.mkv")
@@ -104,7 +109,7 @@ class TestMKVAnalyzer:
         }
         
         mock_result = MagicMock()
-        mock_result.stdout = json.dumps(mock_output)
+        mock_result.stdout = json.dumps(mock_output).encode()
         mock_run.return_value = mock_result
         
         result = self.analyzer.get_audio_languages("/dummy/path.mkv")
@@ -126,32 +131,139 @@ class TestMKVAnalyzer:
         result = self.analyzer.get_audio_languages("/dummy/path.mkv")
         assert result == []
     
-    def test_analyze_movie_folder(self):
+    @patch('mkv_analyzer.subprocess.run')
+    def test_get_audio_languages_uses_ffprobe_cache(self, mock_run, tmp_path):
+        """Test that an unchanged file is only probed once."""
+        mkv_path = tmp_path / "movie.mkv"
+        mkv_path.write_bytes(b"not really an mkv")
+        mock_output = {"streams": [{"index": 1, "codec_name": "aac", "channels": 2, "tags": {"language": "eng"}}]}
+        mock_result = MagicMock()
+        mock_result.stdout = json.dumps(mock_output).encode()
+        mock_run.return_value = mock_result
+        
+        cache_dir = tmp_path / "cache"
+        with patch('mkv_analyzer.FFPROBE_CACHE_DIR', str(cache_dir)):
+            first = self.analyzer.get_audio_languages(str(mkv_path))
+            # Forget the in-process memo so the second lookup has to use the disk cache
+            _probe_audio_tracks.cache_clear()
+            second = self.analyzer.get_audio_languages(str(mkv_path))
+        
+        assert first == second
+        assert first[0]['language'] == 'eng'
+        assert len(list(cache_dir.glob("*.json"))) == 1
+        mock_run.assert_called_once()
+    
+    @patch('mkv_analyzer.subprocess.run')
+    def test_get_audio_languages_memoizes_probe(self, mock_run, tmp_path):
+        """Test that repeated lookups of an unchanged file only probe it once."""
+        mkv_path = tmp_path / "movie.mkv"
+        mkv_path.write_bytes(b"not really an mkv")
+        mock_output = {"streams": [{"index": 1, "codec_name": "aac", "channels": 2, "tags": {"language": "eng"}}]}
+        mock_result = MagicMock()
+        mock_result.stdout = json.dumps(mock_output).encode()
+        mock_run.return_value = mock_result
+        
+        # No on-disk ffprobe cache, so only the in-memory memo can save the second probe
+        with patch('mkv_analyzer._read_ffprobe_cache', return_value=None), \
+             patch('mkv_analyzer._write_ffprobe_cache'):
+            first = self.analyzer.get_audio_languages(str(mkv_path))
+            first[0]['language'] = 'modified'
+            second = self.analyzer.get_audio_languages(str(mkv_path))
+        
+        assert second[0]['language'] == 'eng'
+        assert mock_run.call_count == 1
+    
+    @patch('mkv_analyzer.subprocess.run')
+    def test_get_audio_languages_reprobes_changed_file(self, mock_run, tmp_path):
+        """Test that the memo is invalidated when the file is rewritten."""
+        mkv_path = tmp_path / "movie.mkv"
+        mkv_path.write_bytes(b"not really an mkv")
+        mock_result = MagicMock()
+        mock_result.stdout = json.dumps({"streams": [{"index": 1, "tags": {"language": "eng"}}]}).encode()
+        mock_run.return_value = mock_result
+        
+        with patch('mkv_analyzer._read_ffprobe_cache', return_value=None), \
+             patch('mkv_analyzer._write_ffprobe_cache'):
+            self.analyzer.get_audio_languages(str(mkv_path))
+            mkv_path.write_bytes(b"re-muxed, and not really an mkv either")
+            self.analyzer.get_audio_languages(str(mkv_path))
+        
+        assert mock_run.call_count == 2
+    
+    def test_get_audio_languages_reads_matroska_tracks(self, tmp_path):
+        """Test that audio tracks are read from the Matroska header without ffprobe."""
+        def element(element_id, payload):
+            # EBML element with an 8-byte size field
+            return element_id + bytes([0x01]) + len(payload).to_bytes(7, 'big') + payload
+        
+        header = element(b'\x1a\x45\xdf\xa3', element(b'\x42\x82', b'matroska'))
+        video = element(b'\xae', element(b'\x83', b'\x01') + element(b'\x86', b'V_MPEG4/ISO/AVC'))
+        audio = element(b'\xae', element(b'\x83', b'\x02') + element(b'\x86', b'A_EAC3')
+                        + element(b'\x22\xb5\x9c', b'spa') + element(b'\x53\x6e', b'Spanish [6ch]')
+                        + element(b'\xe1', element(b'\x9f', b'\x06')))
+        segment = element(b'\x18\x53\x80\x67', element(b'\x16\x54\xae\x6b', video + audio))
+        mkv_path = tmp_path / "movie.mkv"
+        mkv_path.write_bytes(header + segment)
+        
+        with patch('mkv_analyzer.subprocess.run') as mock_run:
+            result = self.analyzer.get_audio_languages(str(mkv_path))
+        
+        assert result == [{'index': '1', 'language': 'spa', 'title': 'Spanish [6ch]', 'codec': 'eac3', 'channels': '6'}]
+        mock_run.assert_not_called()
+    
+    def test_analyze_movie_folder(self, tmp_path):
         """Test movie folder analysis."""
         movie_names = ["Test Movie 1", "Test Movie 2"]
         
+        # Only Test Movie 1 has a file in the folder
+        (tmp_path / "Test Movie 1.mkv").write_bytes(b"")
+        
         # Mock the get_audio_languages method
         with patch.object(self.analyzer, 'get_audio_languages') as mock_get_languages:
             mock_get_languages.side_effect = [
                 [{'index': '1', 'language': 'eng', 'title': 'English'}],  # First movie
-                []  # Second movie (not found)
             ]
             
-            # Mock os.path.exists to simulate file existence
-            with patch('mkv_analyzer.os.path.exists') as mock_exists:
-                # Need to handle both possible paths for each movie
-                mock_exists.side_effect = [
-                    True,   # Test Movie 1.mkv exists
-                    False,  # Test Movie 1.MKV doesn't exist
-                    False,  # Test Movie 2.mkv doesn't exist
-                    False   # Test Movie 2.MKV doesn't exist
-                ]
-                
-                result = self.analyzer.analyze_movie_folder("/dummy/folder", movie_names)
-                
-                assert len(result) == 2
-                assert len(result["Test Movie 1"]) == 1
-                assert result["Test Movie 2"] == []
+            result = self.analyzer.analyze_movie_folder(str(tmp_path), movie_names)
+            
+            assert len(result) == 2
+            assert len(result["Test Movie 1"]) == 1
+            assert result["Test Movie 2"] == []
+            mock_get_languages.assert_called_once_with(str(tmp_path / "Test Movie 1.mkv"))
+    
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_analyze_movie_folder_many_movies(self, tmp_path, max_workers):
+        """Test that concurrent probing keeps each movie's own tracks and the requested order."""
+        movie_names = [f"Test Movie {i}" for i in range(10)]
+        for movie_name in movie_names[:8]:
+            (tmp_path / f"{movie_name}.mkv").write_bytes(b"")
+        
+        def fake_languages(path):
+            return [{'index': '1', 'language': 'eng', 'title': os.path.basename(path)}]
+        
+        with patch('mkv_analyzer.MAX_PROBE_WORKERS', max_workers), \
+             patch.object(self.analyzer, 'get_audio_languages', side_effect=fake_languages) as mock_get_languages:
+            result = self.analyzer.analyze_movie_folder(str(tmp_path), movie_names)
+        
+        assert list(result) == movie_names
+        for movie_name in movie_names[:8]:
+            assert result[movie_name][0]['title'] == f"{movie_name}.mkv"
+        assert result["Test Movie 8"] == []
+        assert result["Test Movie 9"] == []
+        assert mock_get_languages.call_count == 8
+    
+    def test_analyze_movie_folder_name_variations(self, tmp_path):
+        """Test that common filename variations are matched to movie names."""
+        for name in ["Thor - The Dark World.mkv", "Guardians of the Galaxy Vol 2.MKV", "Ant-Man and the Wasp.mkv"]:
+            (tmp_path / name).write_bytes(b"")
+        movie_names = ["Thor: The Dark World", "Guardians of the Galaxy Vol 2", "Ant-Man & the Wasp"]
+        
+        with patch.object(self.analyzer, 'get_audio_languages', side_effect=lambda path: [{'path': path}]):
+            result = self.analyzer.analyze_movie_folder(str(tmp_path), movie_names)
+        
+        assert result["Thor: The Dark World"][0]['path'].endswith("Thor - The Dark World.mkv")
+        assert result["Guardians of the Galaxy Vol 2"][0]['path'].endswith("Guardians of the Galaxy Vol 2.MKV")
+        assert result["Ant-Man & the Wasp"][0]['path'].endswith("Ant-Man and the Wasp.mkv")
     
     def test_display_language_summary(self, capsys):
         """Test the display summary method."""
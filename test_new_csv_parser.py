@@ -1,6 +1,8 @@
 import os
 import tempfile
+from unittest.mock import patch
 import pandas as pd
+import new_csv_parser
 from new_csv_parser import extract_scenes, create_sample_csv
 
 def test_new_csv_parser():
@@ -75,6 +77,25 @@ def test_create_sample_csv():
         # Clean up
         os.unlink(temp_csv_path)
 
+def test_extract_scenes_caches_unchanged_file(tmp_path):
+    """An unchanged CSV is parsed once; rewriting it invalidates the cache."""
+    csv_path = tmp_path / 'scenes.csv'
+    create_sample_csv(str(csv_path))
+    
+    with patch('new_csv_parser._parse_scenes', wraps=new_csv_parser._parse_scenes) as mock_parse:
+        first = extract_scenes(str(csv_path))
+        first[0]['movie_show'] = 'Modified'
+        second = extract_scenes(str(csv_path))
+        assert mock_parse.call_count == 1
+        assert second[0]['movie_show'] != 'Modified'
+        
+        # Touch the file so its mtime changes, as an edit would
+        st = os.stat(csv_path)
+        os.utime(csv_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        third = extract_scenes(str(csv_path))
+        assert mock_parse.call_count == 2
+        assert len(third) == len(second)
+
 if __name__ == '__main__':
     print("Testing new CSV parser...")
     test_new_csv_parser()
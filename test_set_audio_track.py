@@ -3,12 +3,20 @@
 Test script for the new set-audio-track command functionality.
 """
 
+import csv
 import os
+import stat
 import tempfile
-import pandas as pd
+from pathlib import Path
+
 from main import set_movie_audio_track
 
-def test_set_audio_track():
+def audio_titles(csv_path, movie_show):
+    """audio_title of every row for movie_show."""
+    with open(csv_path, newline='') as f:
+        return [row['audio_title'] for row in csv.DictReader(f) if row['movie_show'] == movie_show]
+
+def test_set_audio_track(tmp_path):
     """Test the set_movie_audio_track function with various scenarios."""
     
     # Create a temporary CSV file for testing
@@ -51,59 +59,81 @@ def test_set_audio_track():
         }
     ]
     
-    # Create temporary file
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-        df = pd.DataFrame(test_data)
-        df.to_csv(f.name, index=False)
-        temp_csv_path = f.name
+    # Each test gets its own tmp_path, so parallel runs never share the CSV
+    temp_csv_path = str(tmp_path / 'scenes.csv')
+    with open(temp_csv_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(test_data[0]))
+        writer.writeheader()
+        writer.writerows(test_data)
+    
+    print("Testing set_movie_audio_track function...")
+    
+    # Test 1: Update audio track for existing movie
+    print("\n1. Testing audio track update for 'Black Panther' to 'English (Vegamovies.NL) [8ch]'...")
+    result = set_movie_audio_track(temp_csv_path, "Black Panther", "English (Vegamovies.NL) [8ch]")
+    assert result == True, "Should successfully update audio track"
+    
+    # Verify the change
+    titles = audio_titles(temp_csv_path, 'Black Panther')
+    assert titles and all(title == 'English (Vegamovies.NL) [8ch]' for title in titles), "All Black Panther scenes should have the new audio track"
+    print("✅ Success: Black Panther audio track updated")
+    
+    # Test 2: Case-insensitive matching
+    print("\n2. Testing case-insensitive matching with 'black panther'...")
+    result = set_movie_audio_track(temp_csv_path, "black panther", "Spanish (Dual Audio) [5.1]")
+    assert result == True, "Should successfully update audio track with case-insensitive matching"
+    
+    # Verify the change
+    titles = audio_titles(temp_csv_path, 'Black Panther')
+    assert titles and all(title == 'Spanish (Dual Audio) [5.1]' for title in titles), "All Black Panther scenes should have the new audio track"
+    print("✅ Success: Case-insensitive matching works")
+    
+    # Test 3: Non-existent movie
+    print("\n3. Testing non-existent movie...")
+    result = set_movie_audio_track(temp_csv_path, "Non-existent Movie", "German Audio [7.1]")
+    assert result == False, "Should return False for non-existent movie"
+    print("✅ Success: Properly handles non-existent movies")
+    
+    # Test 4: Update specific movie (Thor)
+    print("\n4. Testing audio track update for 'Thor: The Dark World' to 'French (DTS-HD) [7.1]'...")
+    result = set_movie_audio_track(temp_csv_path, "Thor: The Dark World", "French (DTS-HD) [7.1]")
+    assert result == True, "Should successfully update audio track"
+    
+    # Verify the change
+    titles = audio_titles(temp_csv_path, 'Thor: The Dark World')
+    assert titles and all(title == 'French (DTS-HD) [7.1]' for title in titles), "All Thor scenes should have the new audio track"
+    print("✅ Success: Thor audio track updated")
+    
+    print("\n🎉 All tests passed!")
+
+def test_set_audio_track_large_csv(tmp_path):
+    """Only the matching rows of a large CSV are updated, whatever their case."""
+    csv_path = tmp_path / 'large.csv'
+    movies = ['Black Panther', 'BLACK PANTHER', 'Thor: The Dark World', 'Iron Man']
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['movie_show', 'start_timecode', 'end_timecode', 'audio_title'])
+        writer.writerows([movies[i % len(movies)], '0:00:00', '0:00:01', 'Original Audio'] for i in range(10000))
+    
+    assert set_movie_audio_track(str(csv_path), "black panther", "English [8ch]") == True
+    
+    with open(csv_path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 10000
+    for row in rows:
+        expected = "English [8ch]" if row['movie_show'].casefold() == "black panther" else "Original Audio"
+        assert row['audio_title'] == expected
+
+def test_set_audio_track_keeps_file_mode(tmp_path):
+    """Rewriting the CSV keeps its permissions."""
+    csv_path = tmp_path / 'scenes.csv'
+    csv_path.write_text('movie_show,start_timecode,end_timecode,audio_title\nBlack Panther,0:00:14,0:01:45,Original Audio\n')
+    os.chmod(csv_path, 0o644)
+    
+    assert set_movie_audio_track(str(csv_path), "Black Panther", "English [8ch]") == True
     
-    try:
-        print("Testing set_movie_audio_track function...")
-        
-        # Test 1: Update audio track for existing movie
-        print("\n1. Testing audio track update for 'Black Panther' to 'English (Vegamovies.NL) [8ch]'...")
-        result = set_movie_audio_track(temp_csv_path, "Black Panther", "English (Vegamovies.NL) [8ch]")
-        assert result == True, "Should successfully update audio track"
-        
-        # Verify the change
-        df = pd.read_csv(temp_csv_path)
-        black_panther_rows = df[df['movie_show'] == 'Black Panther']
-        assert all(black_panther_rows['audio_title'] == 'English (Vegamovies.NL) [8ch]'), "All Black Panther scenes should have the new audio track"
-        print("✅ Success: Black Panther audio track updated")
-        
-        # Test 2: Case-insensitive matching
-        print("\n2. Testing case-insensitive matching with 'black panther'...")
-        result = set_movie_audio_track(temp_csv_path, "black panther", "Spanish (Dual Audio) [5.1]")
-        assert result == True, "Should successfully update audio track with case-insensitive matching"
-        
-        # Verify the change
-        df = pd.read_csv(temp_csv_path)
-        black_panther_rows = df[df['movie_show'] == 'Black Panther']
-        assert all(black_panther_rows['audio_title'] == 'Spanish (Dual Audio) [5.1]'), "All Black Panther scenes should have the new audio track"
-        print("✅ Success: Case-insensitive matching works")
-        
-        # Test 3: Non-existent movie
-        print("\n3. Testing non-existent movie...")
-        result = set_movie_audio_track(temp_csv_path, "Non-existent Movie", "German Audio [7.1]")
-        assert result == False, "Should return False for non-existent movie"
-        print("✅ Success: Properly handles non-existent movies")
-        
-        # Test 4: Update specific movie (Thor)
-        print("\n4. Testing audio track update for 'Thor: The Dark World' to 'French (DTS-HD) [7.1]'...")
-        result = set_movie_audio_track(temp_csv_path, "Thor: The Dark World", "French (DTS-HD) [7.1]")
-        assert result == True, "Should successfully update audio track"
-        
-        # Verify the change
-        df = pd.read_csv(temp_csv_path)
-        thor_rows = df[df['movie_show'] == 'Thor: The Dark World']
-        assert all(thor_rows['audio_title'] == 'French (DTS-HD) [7.1]'), "All Thor scenes should have the new audio track"
-        print("✅ Success: Thor audio track updated")
-        
-        print("\n🎉 All tests passed!")
-        
-    finally:
-        # Clean up temporary file
-        os.unlink(temp_csv_path)
+    assert stat.S_IMODE(csv_path.stat().st_mode) == 0o644
 
 if __name__ == '__main__':
-    test_set_audio_track() 
\ No newline at end of file
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_set_audio_track(Path(tmp_dir)) 
\ No newline at end of file
@@ -27,6 +27,9 @@ progress_queue = Queue()
 _video_cache = {}
 _cache_lock = threading.Lock()
 
+# Resolved .mkv paths keyed by (movie_folder, movie_show); scenes from the same title share one lookup
+_video_path_cache = {}
+
 # Global cancellation flag for graceful shutdown
 _cancellation_event = threading.Event()
 
@@ -71,6 +74,27 @@ def clear_video_cache():
             except:
                 pass
         _video_cache.clear()
+        _video_path_cache.clear()
+
+def find_video_path(movie_show, movie_folder):
+    """
+    Find the .mkv file for a movie/show, trying the exact title first and then
+    the title with ':' and '/' removed and spaces replaced by underscores.
+    Returns (video_path, found). When nothing exists, video_path is the last candidate tried.
+    """
+    key = (movie_folder, movie_show)
+    video_path = _video_path_cache.get(key)
+    if video_path is not None:
+        return video_path, True
+    
+    video_path = os.path.join(movie_folder, f"{movie_show}.mkv")
+    if not os.path.exists(video_path):
+        base_name = movie_show.replace(':', '').replace('/', '').replace(' ', '_')
+        video_path = os.path.join(movie_folder, f"{base_name}.mkv")
+        if not os.path.exists(video_path):
+            return video_path, False
+    _video_path_cache[key] = video_path
+    return video_path, True
 
 
 def reset_cancellation():
@@ -237,12 +261,8 @@ def create_scene_clip(scene, movie_folder, logger=None, tracker=None, scene_inde
     
     try:
         # Find the video file
-        base_name = scene['movie_show'].replace(':', '').replace('/', '').replace(' ', '_')
-        video_path = os.path.join(movie_folder, f"{scene['movie_show']}.mkv")
-        if not os.path.exists(video_path):
-            # Try with underscores
-            video_path = os.path.join(movie_folder, f"{base_name}.mkv")
-        if not os.path.exists(video_path):
+        video_path, found = find_video_path(scene['movie_show'], movie_folder)
+        if not found:
             error_msg = f"Video file not found for scene: {scene['movie_show']} at {video_path}"
             if logger:
                 logger.log_warning(error_msg)
@@ -508,11 +528,8 @@ def _analyze_and_plan_chunks(scenes, movie_folder, chunk_duration, logger):
     
     for scene in scenes:
         # Check if video file exists
-        base_name = scene['movie_show'].replace(':', '').replace('/', '').replace(' ', '_')
-        video_path = os.path.join(movie_folder, f"{scene['movie_show']}.mkv")
-        if not os.path.exists(video_path):
-            video_path = os.path.join(movie_folder, f"{base_name}.mkv")
-        if not os.path.exists(video_path):
+        video_path, found = find_video_path(scene['movie_show'], movie_folder)
+        if not found:
             logger.log_warning(f"Video file not found for scene: {scene['movie_show']} at {video_path}")
             continue
             